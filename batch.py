@@ -0,0 +1,153 @@
+### Batch runner playing many headless games across a process pool
+### Date:     10/17/2026
+###
+### Usage:  python batch.py --games 1000 --height 20 --width 60 --policy hint
+###
+### Each game is seeded from its index, so a batch can be rerun exactly,
+### and the summary statistics are printed when every game is done.
+
+import sys
+import argparse
+import statistics
+from multiprocessing import Pool
+from session import GameSession, DIRMAP, ATKMAP, ACTIONS, CHASE
+from seeding import make_rng
+
+# Registry of policies, by name.  Each takes a game session and a random
+# number generator, and returns the key to play next.
+POLICIES = {}
+
+
+def register_policy(name):
+	""" Record the decorated function as the policy of the given name """
+
+	def register(fn):
+		POLICIES[name] = fn
+		return fn
+	return register
+
+
+@register_policy('random')
+def random_policy(session, rng):
+	""" Press a random move or attack key, attacking one turn in ten """
+	keys = list(ATKMAP) if rng.random() < 0.1 else list(DIRMAP)
+	return rng.choice(keys)
+
+
+@register_policy('hint')
+def hint_policy(session, rng):
+	""" Follow the shortest path to the goal, attacking any enemy in the
+		way while attacks last """
+
+	d = session.d
+	direction = d.hint()
+	if direction == -1:
+		return rng.choice(ACTIONS)
+
+	if d.current_cell + d.steps[direction] in d.enemies and session.attacks > 0:
+		keys = ATKMAP
+	else:
+		keys = DIRMAP
+	return [k for k, v in keys.items() if v == direction][0]
+
+
+def play_game(job):
+	""" Play one game to the end, or until the turn limit, and return its
+		statistics """
+
+	seed, height, width, policy, max_turns, chase, params = job
+
+	session = GameSession(height, width, seed, chase, **params)
+	rng = make_rng(seed, 'policy')
+	start_attacks = session.attacks
+	start_enemies = session.enemies
+
+	turns = 0
+	while not session.done_status and turns < max_turns:
+		session.step(POLICIES[policy](session, rng))
+		turns += 1
+
+	return {
+		'seed':      seed,
+		'score':     session.score,
+		'moves':     session.moves,
+		'turns':     turns,
+		'died':      session.died,
+		'completed': session.completed,
+		'kills':     start_enemies - session.enemies,
+		'attacks':   start_attacks - session.attacks,
+	}
+
+
+def run_batch(games, height, width, policy='random', seed=0, processes=None,
+		max_turns=None, chase=CHASE, chunksize=8, **params):
+	""" Play a batch of seeded games across a pool of processes (in this
+		process if processes is 1), and return the statistics of each game.
+		Other keyword arguments are passed on to make_new_dungeon. """
+
+	if policy not in POLICIES:
+		raise Exception('Policy \'{}\' is unknown.'.format(policy))
+
+	max_turns = max_turns or 10*height*width
+	jobs = [(seed+n, height, width, policy, max_turns, chase, params) for n in range(games)]
+
+	if processes == 1:
+		return [play_game(job) for job in jobs]
+
+	with Pool(processes) as pool:
+		return list(pool.imap(play_game, jobs, chunksize))
+
+
+def summarize(results):
+	""" Aggregate the score, move, and outcome statistics of a batch """
+
+	scores = [r['score'] for r in results]
+	moves  = [r['moves'] for r in results]
+	games  = len(results)
+
+	return {
+		'games':           games,
+		'score_mean':      statistics.mean(scores),
+		'score_median':    statistics.median(scores),
+		'score_min':       min(scores),
+		'score_max':       max(scores),
+		'moves_mean':      statistics.mean(moves),
+		'moves_median':    statistics.median(moves),
+		'death_rate':      sum(r['died'] for r in results)/games,
+		'completion_rate': sum(r['completed'] for r in results)/games,
+		'timeout_rate':    sum(not r['died'] and not r['completed'] for r in results)/games,
+		'kills_mean':      statistics.mean(r['kills'] for r in results),
+	}
+
+
+def main(argv):
+
+	parser = argparse.ArgumentParser(description='Play many headless dungeon games.')
+	parser.add_argument('--games', type=int, default=100)
+	parser.add_argument('--height', type=int, default=20)
+	parser.add_argument('--width', type=int, default=60)
+	parser.add_argument('--policy', default='random', choices=sorted(POLICIES))
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--processes', type=int, default=None)
+	parser.add_argument('--max-turns', type=int, default=None)
+	parser.add_argument('--chase', type=float, default=CHASE)
+	parser.add_argument('--exploration', type=float)
+	parser.add_argument('--algorithm')
+	parser.add_argument('--enemy-density', type=float)
+	parser.add_argument('--reward-density', type=float)
+	parser.add_argument('--attack-ratio', type=float)
+	args = parser.parse_args(argv)
+
+	# Only pass on the dungeon parameters which were given
+	params = {k: getattr(args, k) for k in ('exploration', 'algorithm',
+		'enemy_density', 'reward_density', 'attack_ratio') if getattr(args, k) is not None}
+
+	results = run_batch(args.games, args.height, args.width, args.policy, args.seed,
+		args.processes, args.max_turns, args.chase, **params)
+
+	for k, v in summarize(results).items():
+		print('{:<16} {}'.format(k, round(v, 3) if isinstance(v, float) else v))
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,110 @@
+### Benchmark of building Cell objects for every cell of a maze, with the
+### slotted Cell against the Cell it replaced
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_cells.py [max_side]
+
+import os, sys, time, random, tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from maze import Maze
+from cell import Cell
+
+SIDES = [100, 300, 1000]
+
+
+class LegacyCell:
+	""" The Cell as it was before it was slotted, kept as the reference: a
+		__dict__, lists of adjacent and accessible cells, and checks of
+		every ID on construction """
+
+	def __init__(self, id, adj, acc):
+		self.id  = id
+		self.adj = adj
+		self.acc = acc
+		self._validate_id(self.id, *self.adj, *self.acc)
+		self._validate_acc()
+
+	def _validate_id(self, *ids):
+		for i in ids:
+			try:
+				assert(type(i) == int)
+			except AssertionError:
+				raise Exception('Provided ID \'{}\' is invalid.'.format(i))
+
+	def _validate_acc(self):
+		for i in self.acc:
+			try:
+				assert(i in self.adj)
+			except AssertionError:
+				raise Exception('Accessible ID \'{}\' is not adjacent.'.format(i))
+
+
+def legacy_cells(m):
+	return [LegacyCell(i, m.adjacent(i), m.accessible(i)) for i in m.cell_ids]
+
+
+def list_cells(m):
+	return [Cell(i, m.adjacent(i), m.accessible(i), width=m.width) for i in m.cell_ids]
+
+
+def mask_cells(m):
+	return m.cell_objects()
+
+
+def check():
+	""" Check that Cells built either way agree with the maze's wall mask
+		on every cell, edge and corner cells included, and on boards one
+		cell wide or high """
+
+	for width, height in ((7, 5), (5, 7), (1, 6), (6, 1), (2, 2), (1, 1)):
+		m = Maze(width, height, 0.5, 'dfs', random.Random(0))
+		m.make_maze()
+		for cells in (list_cells(m), mask_cells(m)):
+			for i, cell in zip(m.cell_ids, cells):
+				assert cell.walls == m.walls[i], (width, height, i)
+				assert cell.adj == m.adjacent(i) and cell.acc == m.accessible(i), (width, height, i)
+		if width > 1:
+			for i in m.cell_ids:
+				assert Cell(i, m.adjacent(i), m.accessible(i)).walls == m.walls[i], (width, height, i)
+
+
+def measure(fn, m):
+	""" Return the seconds taken to build the cells, and the bytes they
+		hold once built """
+
+	start = time.perf_counter()
+	cells = fn(m)
+	seconds = time.perf_counter() - start
+	del cells
+
+	# The cells are held until measured, so that what they hold is counted
+	tracemalloc.start()
+	cells = fn(m)
+	size = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del cells
+	return seconds, size
+
+
+def main(max_side):
+
+	check()
+
+	print('{:>6}  {:<14} {:>10}  {:>12}  {:>10}'.format('side', 'cells', 'seconds', 'bytes', 'B/cell'))
+	for side in [s for s in SIDES if s <= max_side]:
+		m = Maze(side, side, 0.5, 'dfs', random.Random(0))
+		m.make_maze()
+
+		results = {}
+		for name, fn in (('legacy', legacy_cells), ('Cell(adj, acc)', list_cells), ('cell_objects', mask_cells)):
+			results[name] = measure(fn, m)
+			seconds, size = results[name]
+			print('{:>6}  {:<14} {:>10.4f}  {:>12,}  {:>10.1f}'.format(side, name, seconds, size, size/(side*side)))
+
+		old, new = results['legacy'], results['cell_objects']
+		print('{:>6}  cell_objects against legacy: {:.1f}x faster, {:.1f}x less memory'.format(
+			side, old[0]/new[0], old[1]/new[1]))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else SIDES[-1])
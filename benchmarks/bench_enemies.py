@@ -0,0 +1,62 @@
+### Benchmark of moving every enemy one turn, one call per enemy against
+### one batched step
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_enemies.py [max_side]
+
+import os, sys, time, random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dungeon import Dungeon
+from entities import EntityIndex
+
+SIDES = [10, 30, 100, 300, 1000]
+
+# Enemy density used by the game
+DENSITY = 0.1
+TURNS = 5
+
+
+def make_dungeon(side, seed=0):
+	""" Return a dungeon with enemies in a tenth of its cells """
+
+	rng = random.Random(seed)
+	d = Dungeon(side, side, 0.5, 'binary_tree', rng)
+	d.make_maze()
+	d.enemies = EntityIndex(rng.sample(range(1, side*side), int(side*side*DENSITY)))
+	return d
+
+
+def loop_turn(d):
+	for i in d.enemies.ids():
+		d.move_enemy(i)
+
+
+def batch_turn(d):
+	d.step_enemies()
+
+
+def time_turns(side, turn):
+	""" Return the mean seconds per turn, checking no cell is shared """
+
+	d = make_dungeon(side)
+	start = time.perf_counter()
+	for _ in range(TURNS):
+		turn(d)
+	seconds = (time.perf_counter() - start)/TURNS
+
+	assert len(set(d.enemies)) == len(d.enemies), 'Enemies share a cell'
+	return seconds
+
+
+def main(max_side):
+
+	print('{:>6}  {:>8}  {:>12}  {:>12}  {:>8}'.format('side', 'enemies', 'loop (s)', 'batch (s)', 'speedup'))
+	for side in [s for s in SIDES if s <= max_side]:
+		loop  = time_turns(side, loop_turn)
+		batch = time_turns(side, batch_turn)
+		print('{:>6}  {:>8}  {:>12.4f}  {:>12.4f}  {:>8.1f}'.format(
+			side, int(side*side*DENSITY), loop, batch, loop/batch))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else SIDES[-1])
@@ -0,0 +1,44 @@
+### Benchmark of maze generation time against board size
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_generation.py [max_side] [algorithm]
+
+import os, sys, math, time, random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from maze import Maze
+
+# Board sides to time, and the exploration parameter used by the game
+SIDES = [10, 30, 100, 300, 1000, 2000]
+EXPLORATION = 0.5
+
+
+def time_generation(side, algorithm='dfs', seed=0):
+	""" Return the seconds taken to build and generate a square maze """
+
+	rng = random.Random(seed)
+	start = time.perf_counter()
+	m = Maze(side, side, EXPLORATION, algorithm, rng)
+	m.make_maze()
+	return time.perf_counter() - start
+
+
+def main(max_side, algorithm):
+
+	print('Algorithm: {}'.format(algorithm))
+	print('{:>6}  {:>10}  {:>10}  {:>10}'.format('side', 'cells', 'seconds', 'us/cell'))
+	results = []
+	for side in [s for s in SIDES if s <= max_side]:
+		seconds = time_generation(side, algorithm)
+		results.append((side*side, seconds))
+		print('{:>6}  {:>10}  {:>10.4f}  {:>10.2f}'.format(side, side*side, seconds, 1e6*seconds/(side*side)))
+
+	# Fit the scaling exponent (seconds ~ cells^k) between the largest
+	# boards, where fixed overheads no longer dominate
+	if len(results) >= 2:
+		(n0, t0), (n1, t1) = results[-2], results[-1]
+		print('Scaling exponent: {:.2f}'.format(math.log(t1/t0)/math.log(n1/n0)))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else SIDES[-1],
+		sys.argv[2] if len(sys.argv) > 2 else 'dfs')
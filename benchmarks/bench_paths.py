@@ -0,0 +1,77 @@
+### Benchmark of keeping distance fields up to date as walls are broken,
+### updating them in place against searching the maze again
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_paths.py [max_side] [breaks]
+###
+### Breaks random walls of a generated dungeon, as attacks do, with a few
+### distance fields cached.  After every break, each field updated in place
+### is checked against a fresh search from the same source.
+
+import os, sys, time, random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from dungeon import Dungeon
+from pathfinding import DistanceField
+
+SIDES = [10, 30, 100, 300]
+SOURCES = 4
+
+
+def make_dungeon(side, seed=0):
+	""" Return a generated dungeon and the random number generator used """
+
+	rng = random.Random(seed)
+	d = Dungeon(side, side, 0.5, 'dfs', rng)
+	d.make_maze()
+	return d, rng
+
+
+def closed_walls(d):
+	""" Return every pair of adjacent cells with a wall between them """
+	return [(i, i + d.steps[k]) for i in d.cell_ids for k in (1, 2)
+		if d.adjacency[i] & (1 << k) and not d.walls[i] & (1 << k)]
+
+
+def run(side, breaks):
+	""" Break walls one at a time, checking the cached fields against a
+		fresh search after each, and return the number of walls broken and
+		the seconds spent updating the fields in place and searching again """
+
+	d, rng = make_dungeon(side)
+	sources = rng.sample(d.cell_ids, min(SOURCES, len(d.cell_ids)))
+	for s in sources:
+		d.paths.field(s)
+
+	walls = closed_walls(d)
+	rng.shuffle(walls)
+	walls = walls[:breaks]
+
+	updated = searched = 0.
+	for id_a, id_b in walls:
+		start = time.perf_counter()
+		d.remove_wall_pair(id_a, id_b)
+		updated += time.perf_counter() - start
+
+		for s in sources:
+			start = time.perf_counter()
+			fresh = DistanceField(d, s)
+			searched += time.perf_counter() - start
+			assert d.paths.field(s).dist == fresh.dist, \
+				'Distance field from {} differs after breaking {}-{}'.format(s, id_a, id_b)
+
+	return len(walls), updated, searched
+
+
+def main(max_side, breaks):
+
+	print('{:>6}  {:>7}  {:>12}  {:>12}  {:>8}'.format('side', 'breaks', 'in place (s)', 'search (s)', 'speedup'))
+	for side in [s for s in SIDES if s <= max_side]:
+		broken, updated, searched = run(side, breaks)
+		print('{:>6}  {:>7}  {:>12.4f}  {:>12.4f}  {:>8.1f}'.format(
+			side, broken, updated, searched, searched/max(updated, 1e-9)))
+	print('Fields updated in place match a fresh search: OK')
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else SIDES[-1],
+		int(sys.argv[2]) if len(sys.argv) > 2 else 200)
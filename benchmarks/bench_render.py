@@ -0,0 +1,254 @@
+### Benchmark of full-frame maze rendering, with a parity check against
+### the per-cell renderer it replaced, and a check that the incremental
+### renderers leave the same screen as drawing in full
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_render.py [max_side]
+
+import os, sys, time, random, curses
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from maze import Maze, char_dict
+from cell import OPEN
+from dungeon import Dungeon
+from entities import EntityIndex
+from renderer import RenderCache, FogRenderer
+from fov import FieldOfView
+
+SIDES = [10, 30, 100, 300, 1000]
+
+
+def reference_render(self, layer_override=1):
+	""" The per-cell Maze.render, with every junction worked out from
+		the wall mask of the cells around it """
+
+	# Set up of rows of characters
+	print_rows = ['' for _ in range(self.height*2+1)]
+	layers = []
+	walls = self.walls
+
+	# Iterate over all cells in maze
+	for i in self.cell_ids:
+
+		# Identify row and column of this cell
+		row = i//self.width
+		col = i%self.width
+
+		# Determine whether cells immediately above or to the left
+		# are accessible (value of 0 if accessible, -1 if not)
+		a = 0 if walls[i] & OPEN[0] else -1
+		b = 0 if walls[i] & OPEN[3] else -1
+
+		# Select the wall characters around this cell based on
+		# accessibility of other cells (a and b)
+		wall_a = ' ' if a == 0 else '─'
+		wall_b = ' ' if b == 0 else '│'
+
+		# Depending on the current row and column, select the appropriate
+		# junction character for clean rendering
+		if row != 0 and col != 0:
+			# If not in the 0th row or column, use all four cells about
+			# the junction to the upper left of the current cell to
+			# determine the appropriate junction character
+			c = 0 if walls[i-(self.width+1)] & OPEN[2] else -1
+			d = 0 if walls[i-(self.width+1)] & OPEN[1] else -1
+
+			# Pattern ranges from 0 to 15
+			pattern = -1*a + -2*b + -4*c + -8*d
+			jun = char_dict[pattern]
+
+		elif row != 0 and col == 0:
+			# Get junction pattern for the 0th column
+			pattern = -1*a + 2 + 8
+			jun = char_dict[pattern]
+
+		elif row == 0 and col != 0:
+			# Get junction pattern for the 0th row
+			pattern = 1 + 4 + -2*b
+			jun = char_dict[pattern]
+
+		elif row == 0 and col == 0:
+			# Get junction pattern for the 0th row, 0th column
+			jun = '┌'
+
+		# Get the appropriate character for the contents of the cell
+		state, layer = self.cell_state_render(i)
+
+		# Override layer if desired
+		layer *= layer_override
+
+		# Record state and current position if layer is not 0
+		if layer != 0:
+			while len(layers) < layer: layers.append([])
+			xpos = 2*col + 1
+			ypos = 2*row + 1
+			cdata = (xpos, ypos, state)
+			layers[layer-1].append(cdata)
+
+		# Collect the junction, walls, and cell contents and append them
+		# to the rows of characters.  Only layer 0 is used here.
+		cstate = state if layer == 0 else ' '
+		print_rows[2*row]   += (jun + wall_a)
+		print_rows[2*row+1] += (wall_b + cstate)
+
+	# Complete the bottom row of characters
+	for i in range(self.width):
+
+		# Make ID and column
+		id = i + self.width*(self.height-1)
+		col = id%self.width
+
+		# If in the 0th column, make 'bottom left' character
+		# Otherwise, check the accessibility of the cell to the left
+		# and choose the junction character accordingly
+		if i == 0:
+			jun = '└'
+		else:
+			b = 0 if walls[id] & OPEN[3] else -1
+			pattern = 1 + 4 + -8*b
+			jun = char_dict[pattern]
+
+		# Append the boundary and boundary junction for each cell
+		print_rows[-1] += jun + '─'
+
+	# Complete the rightmost column of characters
+	for i in range(self.height):
+
+		# Make ID, row, and column
+		id = self.width*(i+1) - 1
+		col = id%self.width
+		row = id//self.width
+
+		# If in the last column, make 'upper right' character
+		# Otherwise, check the accessibility of the cell direcly above
+		# and choose the junction character accordingly
+		if i == 0:
+			jun = '┐'
+		else:
+			a = 0 if walls[id] & OPEN[0] else -1
+			pattern = 2 + -4*a + 8
+			jun = char_dict[pattern]
+
+		# Append the boundary and boundary junction for each cell
+		print_rows[2*row] += jun
+		print_rows[2*row+1] += '│'
+
+	# Put the 'lower right' character at the end of the last character row
+	print_rows[-1] += '┘'
+
+	# Join the list of rows into a block of rendered text and return
+	return print_rows, layers
+
+
+def check_parity():
+	""" Check the render and text of mazes and populated dungeons of
+		assorted shapes against the per-cell renderer """
+
+	for algorithm in Maze.generators:
+		for width, height in [(1, 1), (1, 6), (6, 1), (2, 2), (13, 7), (40, 25)]:
+			rng = random.Random(width*height)
+			d = Dungeon(width, height, 0.5, algorithm, rng)
+			d.make_maze()
+			d.make_enemies(width*height//10)
+			d.make_rewards(max(width*height//100, 1) if width*height > 2 else 0)
+			d.current_cell = rng.randrange(width*height)
+
+			for override in (0, 1):
+				assert d.render(override) == reference_render(d, override), \
+					'Render mismatch for {} {}x{}'.format(algorithm, width, height)
+	print('Parity with the per-cell renderer: OK')
+
+
+class GridScreen:
+	""" Stand-in for a curses window, keeping each character drawn and
+		its attribute """
+
+	def __init__(self, height, width):
+		self.grid = [[(' ', 0)]*width for _ in range(height)]
+
+	def addstr(self, y, x, text, attr=0):
+		for k, ch in enumerate(text):
+			self.grid[y][x+k] = (ch, attr)
+
+
+def play_frames(fog, turns):
+	""" Play random moves, attacks, and enemy turns, drawing each frame
+		incrementally, and check it against a new renderer drawing the
+		same frame in full """
+
+	rng = random.Random(5)
+	d = Dungeon(30, 12, 0.5, 'dfs', rng)
+	d.make_maze()
+	d.make_enemies(36)
+	d.make_rewards(4)
+	size = (2*d.height+3, 2*d.width+3)
+
+	screen = GridScreen(*size)
+	fov = FieldOfView(d) if fog else None
+	cache = FogRenderer(screen, d, 1, 1, fov) if fog else RenderCache(screen, d, 1, 1)
+
+	for turn in range(turns):
+		cache.draw()
+
+		full = GridScreen(*size)
+		if fog:
+			# A new field of view, as far explored as the one played
+			seen = FieldOfView(d)
+			seen.explored = set(fov.explored)
+			FogRenderer(full, d, 1, 1, seen).draw()
+		else:
+			RenderCache(full, d, 1, 1).draw()
+		assert screen.grid == full.grid, \
+			'Incremental {}render differs from a full draw on turn {}'.format('fog ' if fog else '', turn)
+
+		direction = rng.randrange(4)
+		if rng.random() < 0.3:
+			if d.adjacency[d.current_cell] & OPEN[direction]:
+				d.attack(direction)
+		else:
+			d.move(direction)
+		d.step_enemies(rng)
+
+
+def check_incremental(turns=300):
+	""" Check that the renderers drawing only what changed each frame,
+		with and without fog of war, leave the same screen as a full draw """
+
+	# Color pairs need a terminal, so each pair stands for itself here
+	color_pair, curses.color_pair = curses.color_pair, int
+	try:
+		for fog in (False, True):
+			play_frames(fog, turns)
+	finally:
+		curses.color_pair = color_pair
+	print('Parity of incremental and full draws: OK')
+
+
+def best_of(fn, repeats=3):
+	""" Return the best time of several calls """
+	times = []
+	for _ in range(repeats):
+		start = time.perf_counter()
+		fn()
+		times.append(time.perf_counter() - start)
+	return min(times)
+
+
+def main(max_side):
+
+	check_parity()
+	check_incremental()
+
+	print('{:>6}  {:>12}  {:>12}  {:>8}'.format('side', 'per-cell (s)', 'table (s)', 'speedup'))
+	for side in [s for s in SIDES if s <= max_side]:
+		rng = random.Random(0)
+		d = Dungeon(side, side, 0.5, 'binary_tree', rng)
+		d.make_maze()
+		d.rewards = EntityIndex(rng.sample(d.cell_ids, max(side*side//100, 2)))
+
+		old = best_of(lambda: reference_render(d))
+		new = best_of(lambda: d.render())
+		print('{:>6}  {:>12.4f}  {:>12.4f}  {:>8.1f}'.format(side, old, new, old/new))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else SIDES[-1])
@@ -0,0 +1,103 @@
+### Benchmark of the multiplayer server under many connections
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/bench_server.py [players] [turns] [WIDTHxHEIGHT]
+###
+### Serves one dungeon on a Unix socket and connects the given number of
+### players, each sending a random key every turn and keeping its own copy
+### of the game from the server's messages.  Reports the time taken by each
+### turn and the bytes sent per turn, then checks that every player's copy
+### matches the server's dungeon.
+
+import os, sys, random, asyncio, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from server import GameServer
+from client import GameClient
+from session import ACTIONS
+
+TICK = 0.05
+
+
+async def bot(path, seed, stop):
+	""" Connect a player sending a random key every turn, and once stopped,
+		return its copy of the game, with its connection to close """
+
+	reader, writer = await asyncio.open_unix_connection(path)
+	client = GameClient()
+	rng = random.Random(seed)
+
+	async def receive():
+		while True:
+			data = await reader.read(1 << 16)
+			if not data:
+				return
+			client.feed(data)
+
+	receiving = asyncio.ensure_future(receive())
+	while not stop.is_set():
+		writer.write(rng.choice(ACTIONS).encode())
+		await asyncio.sleep(TICK)
+
+	return client, writer, receiving
+
+
+def matches(client, server):
+	""" Identify whether a player's copy of the game matches the server """
+
+	d, s = client.d, server.d
+	players = {id: (p.cell, p.score, p.attacks, p.moves) for id, p in server.players.items()}
+	return client.turn == server.turn and d.walls == s.walls \
+		and sorted(d.enemies) == sorted(s.enemies) and sorted(d.rewards) == sorted(s.rewards) \
+		and client.players == players
+
+
+async def run(players, turns, width, height):
+
+	path = os.path.join(tempfile.mkdtemp(), 'server.sock')
+	server = GameServer(height, width, seed=0, tick=TICK)
+	serving = asyncio.ensure_future(server.serve(path=path, report=None))
+	await asyncio.sleep(0.1)
+
+	stop = asyncio.Event()
+	bots = [asyncio.ensure_future(bot(path, n, stop)) for n in range(players)]
+	while server.turn < turns:
+		await asyncio.sleep(TICK)
+
+	# Stop sending, and keep playing turns until every player who fell
+	# behind has caught up, then stop the turns and give the last one time
+	# to arrive
+	stop.set()
+	bots = await asyncio.gather(*bots)
+	last = server.turn
+	while server.turn < last + 2 or any(p.stale for p in server.players.values()):
+		await asyncio.sleep(TICK)
+	server.tick = 1e6
+	await asyncio.sleep(3*TICK)
+	clients = [client for client, _, _ in bots]
+	matched = sum(matches(c, server) for c in clients)
+
+	# Disconnect every player before closing the server
+	for _, writer, receiving in bots:
+		receiving.cancel()
+		writer.close()
+	while server.players:
+		await asyncio.sleep(TICK)
+	serving.cancel()
+	times = sorted(server.times)
+	print('{} players, {}x{} board, {} turns over {} levels'.format(players, width, height, server.turn, server.level))
+	print('turn time p50 {:.3f} ms, p99 {:.3f} ms, of a {:.0f} ms tick'.format(
+		1e3*times[len(times)//2], 1e3*times[min(len(times)-1, int(0.99*len(times)))], 1e3*TICK))
+	print('{:.0f} bytes sent per turn, {:.0f} per player'.format(
+		sum(server.sent)/len(server.sent), sum(server.sent)/len(server.sent)/players))
+	print('{} of {} players match the server'.format(matched, players))
+
+
+def main(players, turns, size):
+	width, height = (int(n) for n in size.split('x'))
+	asyncio.run(run(players, turns, width, height))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+		int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+		sys.argv[3] if len(sys.argv) > 3 else '60x30')
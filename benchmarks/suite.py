@@ -0,0 +1,354 @@
+### Benchmark suite for the hot paths of maze and dungeon code, with
+### scaling exponents and stored baselines
+### Date:     10/17/2026
+###
+### Usage:  python benchmarks/suite.py [--max-side 1000] [--cases render,attack]
+###                                    [--save] [--baseline benchmarks/baseline.json]
+###
+### Each case is timed (median of several runs) and its peak memory
+### measured on square boards from 10x10 up to the largest side, and a
+### scaling exponent (seconds ~ cells^k) is fitted to the sizes large enough
+### to time reliably.  The results are compared against the baseline file,
+### and any case whose fastest run is more than the threshold slower than
+### its baseline median, by more than the noise of timing, whose peak
+### memory grew by more than the memory threshold, or which scales worse
+### over the same board sides, is flagged as a regression (with exit
+### status 1).  --save writes the results of the cases run into the
+### baseline instead, keeping those of the cases not run.
+
+import os, sys, json, math, time, random, argparse, platform, statistics, tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from maze import Maze
+from dungeon import Dungeon
+from entities import EntityIndex
+from fov import FieldOfView
+from savefile import pack_dungeon, unpack_dungeon
+
+SIDES = [10, 30, 100, 300, 1000]
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Game parameters
+EXPLORATION = 0.5
+ENEMY_DENSITY = 0.1
+REWARD_DENSITY = 0.01
+ATTACKS = 1000
+
+# Times below this are too short to fit exponents to
+MIN_SECONDS = 1e-3
+
+# Runs timed for each case on each board side, fewer on the largest boards
+REPEATS = 7
+LARGE_REPEATS = 3
+LARGE_SIDE = 1000
+
+# Slowdown counted as a regression.  Runs on a shared machine can take
+# twice as long as each other for seconds at a time, so anything less is
+# left to the scaling exponents to catch.
+THRESHOLD = 2.0
+
+# Noise of timing on a busy machine: a slowdown is only counted as a
+# regression if it is more than this fraction of the baseline time plus
+# this many seconds, as well as beyond the threshold
+NOISE_FRACTION = 0.25
+NOISE_SECONDS = 2e-3
+
+# Growth in peak memory counted as a regression, and growth below which
+# it is not counted, for boards too small to measure closely
+MEMORY_THRESHOLD = 1.25
+MIN_BYTES = 1 << 16
+
+# Registry of benchmark cases, by name.  Each takes a board side and
+# returns a function to time, after any setup that is not to be timed.  A
+# case which changes the state it runs on returns a pair of functions
+# instead: the function to time, and one restoring the state, called
+# (untimed) before each run.
+CASES = {}
+
+
+def register_case(name):
+	""" Record the decorated function as the benchmark case of the given
+		name """
+
+	def register(fn):
+		CASES[name] = fn
+		return fn
+	return register
+
+
+def make_dungeon(side, seed=0):
+	""" Return a generated dungeon with no enemies or rewards """
+	d = Dungeon(side, side, EXPLORATION, 'dfs', random.Random(seed))
+	d.make_maze()
+	return d
+
+
+def populate(d):
+	""" Place the game's density of enemies and rewards in a dungeon """
+	cells = len(d.cell_ids)
+	d.make_enemies(int(cells*ENEMY_DENSITY))
+	d.make_rewards(max(int(cells*REWARD_DENSITY), 2))
+	return d
+
+
+@register_case('make_cells')
+def make_cells(side):
+	m = Maze(side, side, EXPLORATION)
+	return m.make_cells
+
+
+@register_case('cell_objects')
+def cell_objects(side):
+	m = make_dungeon(side)
+	return m.cell_objects
+
+
+@register_case('initialize_walls')
+def initialize_walls(side):
+	m = make_dungeon(side)
+	return m.initialize_walls
+
+
+@register_case('make_maze')
+def make_maze(side):
+	m = Maze(side, side, EXPLORATION, 'dfs', random.Random(0))
+	return m.make_maze
+
+
+@register_case('render')
+def render(side):
+	d = populate(make_dungeon(side))
+	return d.render
+
+
+@register_case('make_enemies')
+def make_enemies(side):
+	d = make_dungeon(side)
+
+	def run():
+		d.enemies = EntityIndex()
+		d.make_enemies(int(side*side*ENEMY_DENSITY))
+	return run
+
+
+@register_case('make_rewards')
+def make_rewards(side):
+	d = make_dungeon(side)
+
+	def run():
+		d.rewards = EntityIndex()
+		d.make_rewards(max(int(side*side*REWARD_DENSITY), 2))
+	return run
+
+
+@register_case('move_enemy')
+def move_enemy(side):
+	""" One turn of moving every enemy with a call each """
+	d = populate(make_dungeon(side))
+
+	def run():
+		for id in d.enemies.ids():
+			d.move_enemy(id)
+	return run
+
+
+@register_case('step_enemies')
+def step_enemies(side):
+	""" One turn of moving every enemy in one batched step """
+	d = populate(make_dungeon(side))
+	return d.step_enemies
+
+
+@register_case('attack')
+def attack(side):
+	""" A fixed number of attacks from random cells in random directions,
+		each breaking a wall or hitting whatever is beyond it """
+
+	saved = pack_dungeon(populate(make_dungeon(side)))
+	rng = random.Random(0)
+	moves = [(rng.randrange(side*side), rng.randrange(4)) for _ in range(ATTACKS)]
+	state = {}
+
+	# Every run starts from the same dungeon, as walls broken and enemies
+	# killed by one run would leave the next little to do
+	def reset():
+		state['d'] = unpack_dungeon(Dungeon, saved)[0]
+
+	def run():
+		d = state['d']
+		for cell, direction in moves:
+			if d.adjacency[cell] & (1 << direction):
+				d.current_cell = cell
+				d.attack(direction)
+	return run, reset
+
+
+@register_case('field_of_view')
+def field_of_view(side):
+	""" Sight from a fixed number of random cells, with nothing cached """
+
+	d = make_dungeon(side)
+	fov = FieldOfView(d)
+	rng = random.Random(0)
+	cells = [rng.randrange(side*side) for _ in range(ATTACKS)]
+
+	def run():
+		fov.cache.clear()
+		for cell in cells:
+			fov.sight(cell)
+	return run
+
+
+def measure(case, side, repeats):
+	""" Return the median and the best time of several runs of a case,
+		and the peak memory allocated during one more run """
+
+	fn = CASES[case](side)
+	fn, reset = fn if isinstance(fn, tuple) else (fn, None)
+	times = []
+	for _ in range(repeats):
+		if reset is not None:
+			reset()
+		start = time.perf_counter()
+		fn()
+		times.append(time.perf_counter() - start)
+
+	if reset is not None:
+		reset()
+	tracemalloc.start()
+	fn()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return statistics.median(times), min(times), peak
+
+
+def fit_exponent(points):
+	""" Fit k in seconds ~ cells^k by least squares on log scales, over the
+		points timed reliably, or return None if there are too few """
+
+	points = [(math.log(n), math.log(t)) for n, t in points if t >= MIN_SECONDS]
+	if len(points) < 2:
+		return None
+
+	mx = sum(x for x, _ in points)/len(points)
+	my = sum(y for _, y in points)/len(points)
+	sxx = sum((x-mx)**2 for x, _ in points)
+	sxy = sum((x-mx)*(y-my) for x, y in points)
+	return sxy/sxx if sxx else None
+
+
+def run_suite(cases, sides):
+	""" Run every case on every board side, printing as it goes, and return
+		the results by case """
+
+	results = {}
+	print('{:<18} {:>6}  {:>11}  {:>10}  {:>12}'.format('case', 'side', 'seconds', 'us/cell', 'peak memory'))
+	for case in cases:
+		sizes = {}
+		for side in sides:
+			seconds, best, peak = measure(case, side, REPEATS if side < LARGE_SIDE else LARGE_REPEATS)
+			sizes[str(side)] = {'seconds': seconds, 'best': best, 'peak_bytes': peak}
+			print('{:<18} {:>6}  {:>11.5f}  {:>10.3f}  {:>12,}'.format(
+				case, side, seconds, 1e6*seconds/(side*side), peak))
+
+		exponent = fitted_exponent(sizes, sizes)
+		results[case] = {'sizes': sizes, 'exponent': exponent}
+		print('{:<18} scaling exponent: {}'.format(case, 'n/a' if exponent is None else '{:.2f}'.format(exponent)))
+	return results
+
+
+def fitted_exponent(sizes, sides):
+	""" Return the scaling exponent fitted to the given sides of a case """
+	return fit_exponent([(int(s)**2, sizes[s]['seconds']) for s in sides])
+
+
+def compare(results, baseline, threshold, exponent_margin, memory_threshold):
+	""" Return a list describing every regression against the baseline.
+		The fastest of the runs is compared against the baseline median,
+		so that a run slowed by the machine rather than the code is not
+		counted.  Both scaling exponents are fitted again over the sides
+		timed reliably in both, as the exponent depends on the sides fitted. """
+
+	regressions = []
+	for case, result in results.items():
+		if case not in baseline:
+			continue
+		base = baseline[case]
+
+		for side, r in result['sizes'].items():
+			if side not in base['sizes']:
+				continue
+			old = base['sizes'][side]['seconds']
+			new = r['best']
+			if new > threshold*old and new - old > NOISE_FRACTION*old + NOISE_SECONDS:
+				regressions.append('{} at {}x{}: fastest {:.5f}s against {:.5f}s ({:.1f}x)'.format(
+					case, side, side, new, old, new/old))
+
+			old = base['sizes'][side]['peak_bytes']
+			new = r['peak_bytes']
+			if new > memory_threshold*old and new - old > MIN_BYTES:
+				regressions.append('{} at {}x{}: peak memory {:,} bytes against {:,} ({:.1f}x)'.format(
+					case, side, side, new, old, new/max(old, 1)))
+
+		sides = [s for s in result['sizes'] if s in base['sizes']
+			and min(result['sizes'][s]['seconds'], base['sizes'][s]['seconds']) >= MIN_SECONDS]
+		new = fitted_exponent(result['sizes'], sides)
+		old = fitted_exponent(base['sizes'], sides)
+		if new is not None and old is not None and new > old + exponent_margin:
+			regressions.append('{} scaling exponent: {:.2f} against {:.2f}'.format(case, new, old))
+
+	return regressions
+
+
+def main(argv):
+
+	parser = argparse.ArgumentParser(description='Benchmark the maze and dungeon hot paths.')
+	parser.add_argument('--max-side', type=int, default=SIDES[-1])
+	parser.add_argument('--cases', default=','.join(CASES))
+	parser.add_argument('--baseline', default=BASELINE)
+	parser.add_argument('--save', action='store_true', help='write the results into the baseline')
+	parser.add_argument('--threshold', type=float, default=THRESHOLD, help='slowdown counted as a regression')
+	parser.add_argument('--exponent-margin', type=float, default=0.25)
+	parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+		help='growth in peak memory counted as a regression')
+	args = parser.parse_args(argv)
+
+	cases = args.cases.split(',')
+	for case in cases:
+		if case not in CASES:
+			raise Exception('Benchmark case \'{}\' is unknown.'.format(case))
+
+	results = run_suite(cases, [s for s in SIDES if s <= args.max_side])
+
+	if args.save:
+		cases = {}
+		if os.path.exists(args.baseline):
+			with open(args.baseline) as f:
+				cases = json.load(f)['cases']
+		cases.update(results)
+		record = {
+			'python':   platform.python_version(),
+			'platform': platform.platform(),
+			'cases':    cases,
+		}
+		with open(args.baseline, 'w') as f:
+			json.dump(record, f, indent=1)
+		print('Baseline written to {}'.format(args.baseline))
+		return 0
+
+	if not os.path.exists(args.baseline):
+		print('No baseline at {}; run with --save to make one.'.format(args.baseline))
+		return 0
+
+	with open(args.baseline) as f:
+		baseline = json.load(f)['cases']
+
+	regressions = compare(results, baseline, args.threshold, args.exponent_margin, args.memory_threshold)
+	for r in regressions:
+		print('REGRESSION: ' + r)
+	print('{} regressions against {}'.format(len(regressions), args.baseline))
+	return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
@@ -2,21 +2,82 @@
 ### Author:   gdgrant
 ### Date:     11/6/2018
 
+import os
 
-class Cell:
-    """ Unit cell for a square grid graph """
+# Wall mask bits for each direction of travel out of a cell, indexed by
+# direction (0 = 'up', 1 = 'right', 2 = 'down', 3 = 'left').  A set bit
+# means the passage in that direction is open.
+OPEN = (1, 2, 4, 8)
+OPPOSITE = (2, 3, 0, 1)
+
+# Directions in the order the original adjacency lists were built (left,
+# right, up, down)
+ORDER = (3, 1, 0, 2)
 
-    def __init__(self, id, adj, acc):
-        """ Set the cell's ID, adjacent cells, and accessible cells """
-        self.id    = id     # Number of this cell
-        self.adj   = adj    # List of ids of adjacent cells
-        self.acc   = acc    # List of ids to which there is access
+# For each 4-bit wall mask, the open directions in that order
+OPEN_DIRS = tuple(tuple(d for d in ORDER if mask & OPEN[d]) for mask in range(16))
 
-        # Check that all IDs used in initialization are valid
-        self._validate_id(self.id, *self.adj, *self.acc)
+# Neighbor ID of a cell with no neighbor in a direction (at the edge)
+NONE = -1
 
-        # Check that all accessible cells are adjacent
-        self._validate_acc()
+# Checking the IDs given to each new Cell costs more than building it, so
+# it is only done in debug mode, set by this environment variable
+DEBUG_VAR = 'TERMINAL_DUNGEON_DEBUG'
+VALIDATE = bool(os.environ.get(DEBUG_VAR))
+
+
+class Cell:
+    """ Unit cell for a square grid graph.  Holds the IDs of its (at most
+        four) neighbors in a fixed slot for each direction, and which of
+        them it can access as a wall mask, without a __dict__ or lists. """
+
+    __slots__ = ('id', 'up', 'right', 'down', 'left', 'walls')
+
+    def __init__(self, id, adj, acc, validate=None, width=None):
+        """ Set the cell's ID, adjacent cells, and accessible cells.  The
+            direction of each adjacent cell is worked out from the
+            difference of the IDs, as Maze.direction does: by the grid width
+            if given, or else taking a difference of one as left or right
+            and any other as up or down, which holds for any grid more than
+            one cell wide.  The IDs are checked if validate is set, or by
+            default in debug mode. """
+
+        if validate if validate is not None else VALIDATE:
+            # Check that all IDs used in initialization are valid
+            self._validate_id(id, *adj, *acc)
+
+            # Check that all accessible cells are adjacent
+            self._validate_acc(adj, acc)
+
+        neighbors = [NONE]*4
+        walls = 0
+        for i in adj:
+            d = self._direction_of(id, i, width)
+            if neighbors[d] != NONE:
+                raise Exception('Cell \'{}\' has two adjacent cells in one direction.'.format(id))
+            neighbors[d] = i
+            if i in acc:
+                walls |= OPEN[d]
+
+        self.id = id
+        self.up, self.right, self.down, self.left = neighbors
+        self.walls = walls
+
+
+    @classmethod
+    def from_mask(cls, id, up, right, down, left, walls):
+        """ Make a cell from the IDs of its neighbors in each direction
+            (NONE where there is none) and its wall mask, as a maze holds
+            them, without checking them """
+
+        cell = cls.__new__(cls)
+        cell.id    = id
+        cell.up    = up
+        cell.right = right
+        cell.down  = down
+        cell.left  = left
+        cell.walls = walls
+        return cell
 
 
     def __repr__(self):
@@ -24,44 +85,159 @@ class Cell:
         return 'Cell(id={}, adj={}, acc={})'.format(self.id, self.adj, self.acc)
 
 
-    def _validate_id(self, *ids):
+    @staticmethod
+    def _direction_of(id, target, width=None):
+        """ Return the direction from a cell to an adjacent cell """
+        diff = target - id
+        if width is not None:
+            if diff in (-width, width, 1, -1):
+                return 0 if diff == -width else 2 if diff == width else 1 if diff == 1 else 3
+        elif diff != 0:
+            return 1 if diff == 1 else 3 if diff == -1 else 0 if diff < 0 else 2
+        raise Exception('Adjacent ID \'{}\' is not next to cell \'{}\'.'.format(target, id))
+
+
+    @staticmethod
+    def _validate_id(*ids):
         """ Check that all IDs are of the correct format """
         for i in ids:
-            try:
-                assert(type(i) == int)
-            except AssertionError:
+            if type(i) != int:
                 raise Exception('Provided ID \'{}\' is invalid.'.format(i))
 
 
-    def _validate_acc(self):
+    @staticmethod
+    def _validate_acc(adj, acc):
         """ Check that all accessible IDs are also adjacent """
-        for i in self.acc:
-            try:
-                assert(i in self.adj)
-            except AssertionError:
+        for i in acc:
+            if i not in adj:
                 raise Exception('Accessible ID \'{}\' is not adjacent.'.format(i))
 
 
+    @property
+    def neighbors(self):
+        """ IDs of the neighbors in each direction (NONE where there is
+            none) """
+        return (self.up, self.right, self.down, self.left)
+
+
+    @property
+    def adj(self):
+        """ List of ids of adjacent cells """
+        neighbors = self.neighbors
+        return [neighbors[d] for d in ORDER if neighbors[d] != NONE]
+
+
+    @property
+    def acc(self):
+        """ List of ids to which there is access """
+        neighbors = self.neighbors
+        return [neighbors[d] for d in OPEN_DIRS[self.walls]]
+
+
+    def direction(self, target):
+        """ Return the direction of an adjacent cell, or -1 if the target
+            is not adjacent """
+        if target == NONE:
+            return -1
+        neighbors = self.neighbors
+        return neighbors.index(target) if target in neighbors else -1
+
+
     def can_access(self, target):
         """ Identify whether another cell is accessible """
-        return 0 if target in self.acc else -1
+        d = self.direction(target)
+        return 0 if d != -1 and self.walls & OPEN[d] else -1
 
 
     def block_access(self, target):
-        """ Remove the target from list of accessible cells """
-        if target in self.acc:
-            self.acc.remove(target)
+        """ Remove access to the target """
+        d = self.direction(target)
+        if d != -1 and self.walls & OPEN[d]:
+            self.walls &= ~OPEN[d]
             return 0
         else:
             return -1
 
     def make_access(self, target):
-        """ Add the target to list of accessible cells, if viable """
-        if target in self.adj:
-            if target not in self.acc:
-                self.acc.append(target)
+        """ Give access to the target, if viable """
+        d = self.direction(target)
+        if d != -1:
+            if not self.walls & OPEN[d]:
+                self.walls |= OPEN[d]
                 return 0
             else:
                 return -1
         else:
             return -2
+
+
+class CellView:
+    """ Cell-compatible view onto one square of a Maze's wall mask """
+
+    __slots__ = ('maze', 'id')
+
+    def __init__(self, maze, id):
+        """ Set the maze being viewed and the ID of the viewed cell """
+        self.maze  = maze
+        self.id    = id
+
+
+    def __repr__(self):
+        """ Return the Cell's ID, adjacent cells, and accessible cells """
+        return 'Cell(id={}, adj={}, acc={})'.format(self.id, self.adj, self.acc)
+
+
+    @property
+    def adj(self):
+        """ List of ids of adjacent cells """
+        return self.maze.adjacent(self.id)
+
+
+    @property
+    def acc(self):
+        """ List of ids to which there is access """
+        return self.maze.accessible(self.id)
+
+
+    def can_access(self, target):
+        """ Identify whether another cell is accessible """
+        return self.maze.can_access(self.id, target)
+
+
+    def block_access(self, target):
+        """ Remove the target from list of accessible cells """
+        return self.maze.block_access(self.id, target)
+
+
+    def make_access(self, target):
+        """ Add the target to list of accessible cells, if viable """
+        return self.maze.make_access(self.id, target)
+
+
+class CellViewList:
+    """ Read-only sequence of CellViews, materialized as they are indexed """
+
+    __slots__ = ('maze',)
+
+    def __init__(self, maze):
+        self.maze = maze
+
+
+    def __len__(self):
+        return len(self.maze.cell_ids)
+
+
+    def __getitem__(self, i):
+        """ Return the view for a cell ID, or a list of views for a slice """
+        if isinstance(i, slice):
+            return [CellView(self.maze, j) for j in range(len(self))[i]]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('Cell ID \'{}\' is out of range.'.format(i))
+        return CellView(self.maze, i)
+
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield CellView(self.maze, i)
@@ -0,0 +1,263 @@
+### Client for the multiplayer server
+### Date:     10/17/2026
+###
+### Usage:  python client.py [HOST:PORT | PATH]
+###
+### Keeps a copy of the server's dungeon, made from the whole level when
+### joining and kept up to date by applying each delta the server sends,
+### and draws it as the single player game does, with the other players
+### shown as '@'.  Keys are sent to the server as they are pressed.
+
+import sys
+import curses
+import asyncio
+from dungeon import Dungeon
+from savefile import unpack_dungeon
+from server import FRAME, WELCOME, SNAPSHOT, DELTA, SNAPSHOT_HEADER, DELTA_HEADER, \
+	PLAYER_ID, PLAYER, CELL, ENEMY, REWARD, PORT
+from framebuffer import FrameBuffer
+from main import setup_curses, make_renderer, FRAME as FRAME_TIME, POLL
+
+
+class RemoteDungeon(Dungeon):
+	""" A copy of the server's dungeon, with the cells of the other players
+		to draw along with the player's own """
+
+	def __init__(self, width, height, exploration, algorithm='dfs', rng=None):
+		Dungeon.__init__(self, width, height, exploration, algorithm, rng)
+		self.others = {}	# Number of other players in each cell they occupy
+
+
+	def cell_state_render(self, i):
+		""" An update to the Dungeon state render, showing other players
+			(@) where the player and enemies are not """
+
+		state, layer = Dungeon.cell_state_render(self, i)
+		if i in self.others and layer < 2:
+			return '@', 3
+		return state, layer
+
+
+	def occupied_cells(self):
+		return Dungeon.occupied_cells(self) + list(self.others)
+
+
+class GameClient:
+	""" The state of the game as last sent by the server: the dungeon, and
+		the state of every player, by ID """
+
+	def __init__(self):
+		self.id      = None
+		self.d       = None
+		self.turn    = 0
+		self.players = {}		# (cell, score, attacks, moves) of each player
+		self.buffer  = b''
+		self.reset   = False	# Whole level received since last checked
+
+
+	def feed(self, data):
+		""" Apply every whole message received, keeping the rest for the
+			next data, and return the number of messages applied """
+
+		self.buffer += data
+		count = 0
+		offset = 0
+		while len(self.buffer) - offset >= FRAME.size:
+			length, kind = FRAME.unpack_from(self.buffer, offset)
+			if len(self.buffer) - offset - FRAME.size < length:
+				break
+			payload = self.buffer[offset+FRAME.size:offset+FRAME.size+length]
+			offset += FRAME.size + length
+
+			if kind == WELCOME:
+				self.id, = PLAYER_ID.unpack_from(payload)
+				self.apply_snapshot(payload[PLAYER_ID.size:])
+			elif kind == SNAPSHOT:
+				self.apply_snapshot(payload)
+			elif kind == DELTA:
+				self.apply_delta(payload)
+			else:
+				raise Exception('Message type \'{}\' is unknown.'.format(kind))
+			count += 1
+
+		self.buffer = self.buffer[offset:]
+		return count
+
+
+	def apply_snapshot(self, payload):
+		""" Replace the game with the whole level sent """
+
+		self.turn, count = SNAPSHOT_HEADER.unpack_from(payload)
+		offset = SNAPSHOT_HEADER.size
+
+		self.players = {}
+		for _ in range(count):
+			id, *state = PLAYER.unpack_from(payload, offset)
+			self.players[id] = tuple(state)
+			offset += PLAYER.size
+
+		self.d = unpack_dungeon(RemoteDungeon, payload, offset)[0]
+		self.place_players()
+		self.reset = True
+
+
+	def apply_delta(self, payload):
+		""" Apply the changes of one turn """
+
+		d = self.d
+		self.turn, num_cells, num_players, num_left = DELTA_HEADER.unpack_from(payload)
+		offset = DELTA_HEADER.size
+
+		cells = [CELL.unpack_from(payload, offset + k*CELL.size) for k in range(num_cells)]
+		offset += num_cells*CELL.size
+
+		# Take entities out of cells before putting any in, as an enemy may
+		# have moved into a cell another has just left
+		walls_changed = False
+		for i, walls, contents in cells:
+			if d.walls[i] != walls:
+				d.walls[i] = walls
+				d.dirty_walls.add(i)
+				walls_changed = True
+			if not contents & ENEMY and i in d.enemies:
+				d.enemies.remove(i)
+			if not contents & REWARD and i in d.rewards:
+				d.rewards.remove(i)
+			d.dirty.add(i)
+
+		for i, walls, contents in cells:
+			if contents & ENEMY and i not in d.enemies:
+				d.enemies.add(i)
+			if contents & REWARD and i not in d.rewards:
+				d.rewards.add(i)
+
+		if walls_changed:
+			d.paths.clear()
+			d.wall_version += 1
+
+		for _ in range(num_players):
+			id, *state = PLAYER.unpack_from(payload, offset)
+			self.players[id] = tuple(state)
+			offset += PLAYER.size
+
+		for _ in range(num_left):
+			id, = PLAYER_ID.unpack_from(payload, offset)
+			self.players.pop(id, None)
+			offset += PLAYER_ID.size
+
+		self.place_players()
+
+
+	def place_players(self):
+		""" Move the player and the other players to their cells in the
+			dungeon, marking the cells they leave and enter to be drawn """
+
+		d = self.d
+		d.dirty.update(d.others)
+		d.dirty.add(d.current_cell)
+
+		d.others = {}
+		for id, (cell, score, attacks, moves) in self.players.items():
+			if id == self.id:
+				d.current_cell = cell
+			else:
+				d.others[cell] = d.others.get(cell, 0) + 1
+
+		d.dirty.update(d.others)
+		d.dirty.add(d.current_cell)
+
+
+	def state(self):
+		""" Return the player's own (cell, score, attacks, moves) """
+		return self.players.get(self.id, (0, 0, 0, 0))
+
+
+async def connect(address):
+	""" Open a connection to a server, over a Unix socket if the address
+		is a path, or else over TCP to HOST:PORT """
+
+	if '/' in address:
+		return await asyncio.open_unix_connection(address)
+	host, _, port = address.partition(':')
+	return await asyncio.open_connection(host or '127.0.0.1', int(port or PORT))
+
+
+async def play(stdscr, address):
+	""" Play on a server until 'q' is pressed or the server goes away """
+
+	height, width = setup_curses(stdscr)
+	stdscr.nodelay(True)
+	stdscr = FrameBuffer(stdscr)
+	dheight = (height-10)//2
+	dwidth  = (width-3)//2
+
+	reader, writer = await connect(address)
+	client = GameClient()
+
+	# Set when keys are waiting to be read or messages have been applied
+	wake = asyncio.Event()
+	loop = asyncio.get_running_loop()
+	loop.add_reader(sys.stdin.fileno(), wake.set)
+
+	async def receive():
+		while True:
+			data = await reader.read(1 << 16)
+			if not data:
+				return
+			if client.feed(data):
+				wake.set()
+
+	receiving = asyncio.ensure_future(receive())
+	cache = None
+	try:
+		while not receiving.done():
+			try:
+				await asyncio.wait_for(wake.wait(), POLL)
+			except asyncio.TimeoutError:
+				pass
+			wake.clear()
+
+			# Send the keys pressed, quitting if 'q' is pressed
+			keys = []
+			while True:
+				try:
+					keys.append(stdscr.getkey())
+				except curses.error:
+					break
+			if 'q' in keys or 'Q' in keys:
+				break
+			writer.write(''.join(k for k in keys if len(k) == 1).encode('ascii', 'ignore'))
+
+			if client.d is None:
+				continue
+
+			# Draw the maze, in full after a new level
+			d = client.d
+			if client.reset or cache is None:
+				client.reset = False
+				stdscr.clear()
+				cache = make_renderer(stdscr, d, dheight, dwidth)
+				dby = min(d.height, dheight) * 2 + 1
+			cache.draw()
+
+			cell, score, attacks, moves = client.state()
+			stdscr.addstr(dby+2,0,'[wasd] to move.               | Moves:        {:<4}'.format(moves))
+			stdscr.addstr(dby+3,0,'Shift+[wasd] to attack.       | Attacks left: {:<4}'.format(attacks))
+			stdscr.addstr(dby+4,0,'[q] to quit.                  | Players:      {:<4}'.format(len(client.players)))
+			stdscr.addstr(dby+5,0,'Goal: Reach the bottom right. | Score:        {:<6}'.format(score))
+			stdscr.refresh()
+
+			await asyncio.sleep(FRAME_TIME)
+	finally:
+		loop.remove_reader(sys.stdin.fileno())
+		receiving.cancel()
+		writer.close()
+
+
+def client_main(stdscr, address):
+	asyncio.run(play(stdscr, address))
+
+
+if __name__ == '__main__':
+
+	curses.wrapper(client_main, sys.argv[1] if len(sys.argv) > 1 else '127.0.0.1:{}'.format(PORT))
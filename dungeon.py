@@ -2,19 +2,21 @@
 ### Author:   gdgrant
 ### Date:     11/6/2018
 
-import random, copy
 from maze import Maze
+from cell import OPEN_DIRS
+from entities import EntityIndex
+import savefile
 
 class Dungeon(Maze):
     """ A 2-D dungeon crawler, including randomized enemies """
 
-    def __init__(self, width, height, exploration):
+    def __init__(self, width, height, exploration, algorithm='dfs', rng=None):
         """ Build the associated room (maze) based on the given parameters,
-            and set up the enemies list """
+            and set up the enemy and reward indices """
 
-        Maze.__init__(self, width, height, exploration)
-        self.enemies = []
-        self.rewards = []
+        Maze.__init__(self, width, height, exploration, algorithm, rng)
+        self.enemies = EntityIndex()
+        self.rewards = EntityIndex()
 
 
     def cell_state_render(self, i):
@@ -42,33 +44,150 @@ class Dungeon(Maze):
         return state, layer
 
 
+    def cell_state_read(self, i, state):
+        """ An update to the Maze state read, now including enemies (o),
+            rewards (*), and the overlap symbol (+).  Rewards hidden under
+            another symbol cannot be read back. """
+
+        if state == 'x' or state == '+':
+            self.current_cell = i
+        if state == 'o' or state == '+':
+            self.enemies.add(i)
+        elif state == '*':
+            self.rewards.add(i)
+
+
+    def save(self, path, moves=0, attacks=0, score=0, done_status=False):
+        """ Write the dungeon, with the given game state, to a binary save
+            file """
+        savefile.save(path, self, moves=moves, attacks=attacks, score=score, done_status=done_status)
+
+
+    @classmethod
+    def load(cls, path, offset=0):
+        """ Load a dungeon from a memory-mapped save file, and return it
+            with its game state in the form made by make_new_dungeon """
+        return savefile.load(cls, path, offset)
+
+
+    def occupied_cells(self):
+        """ Return the IDs of cells which may hold the player, the goal,
+            enemies, or rewards """
+        return [self.current_cell, self.cell_ids[-1]] + list(self.enemies) + list(self.rewards)
+
+
+    def free_cells(self, index):
+        """ Return the pool of the cells not occupied in the given entity
+            index, which the index keeps up to date once it is made, so
+            only the first call for each index costs a pass over the cells """
+        return index.free_cells(len(self.cell_ids), self.rng)
+
+
+    def place(self, index, num, exclude=(), rng=None):
+        """ Place as many new entities as requested into random cells not
+            already occupied in the given entity index (or excluded), and
+            return their IDs.  The dungeon's own random number generator
+            is used unless another is given. """
+
+        rng = rng if rng is not None else self.rng
+        pool = self.free_cells(index)
+        exclude = {c for c in exclude if c in pool}
+        if num > len(pool) - len(exclude):
+            raise Exception('Cannot place {} entities in {} free cells.'.format(num, len(pool) - len(exclude)))
+
+        # Adding an entity takes its cell out of the pool
+        ids = []
+        for _ in range(num):
+            c = pool.choice(rng)
+            while c in exclude:
+                c = pool.choice(rng)
+            ids.append(index.add(c))
+            self.dirty.add(c)
+        return ids
+
+
     def make_enemies(self, num):
         """ Make add new enemies, as many as requested,
             into clear dungeon spaces """
-        for n in range(num):
-            self.enemies.append(random.choice(list(set(self.cell_ids)-set(self.enemies+[self.current_cell]))))
+        return self.place(self.enemies, num, [self.current_cell])
 
 
     def make_rewards(self, num):
-
-        for n in range(num):
-            self.rewards.append(random.choice(list(set(self.cell_ids)-set(self.rewards+[self.current_cell, self.cell_list[-1]]))))
+        """ Add new rewards, as many as requested, into dungeon
+            spaces clear of rewards, the player, and the goal """
+        return self.place(self.rewards, num, {self.current_cell, self.cell_ids[-1]})
 
 
     def move_enemy(self, id):
-        """ Randomly move an enemy based on its ID (aka its
-            position in the enemies list) """
+        """ Randomly move an enemy based on its ID (which stays the
+            same for as long as the enemy lives) """
 
-        moves_list = copy.copy(self.cell_list[self.enemies[id]].acc)
-        for m in moves_list:
-            if m in self.enemies:
-                moves_list.remove(m)
+        moves_list = [m for m in self.accessible(self.enemies[id]) if m not in self.enemies]
 
         if moves_list != []:
-            self.enemies[id] = random.choice(moves_list)
+            self.dirty.add(self.enemies[id])
+            self.enemies.move(id, self.rng.choice(moves_list))
+            self.dirty.add(self.enemies[id])
         else:
             pass
 
+
+    def step_enemies(self, rng=None, chase=0.):
+        """ Randomly move every enemy in one pass, drawing all the random
+            numbers up front.  Enemies move in order of ID, each to an
+            accessible cell that no enemy holds after the moves before it,
+            so two enemies never land on the same cell.  With probability
+            chase, an enemy instead moves along a shortest path towards
+            the player.  Return the number of enemies that moved.  The
+            dungeon's own random number generator is used unless another
+            is given. """
+
+        rng = rng if rng is not None else self.rng
+        walls = self.walls
+        cells = self.enemies.cells
+        occupants = self.enemies.occupants
+
+        # The pool of free cells, if the index keeps one, in which each move
+        # puts the enemy's old cell in the place of the new one
+        free = self.enemies.free
+        free_ids, free_pos = (free.ids, free.pos) if free is not None else (None, None)
+
+        # Offsets to the accessible neighbors for each wall mask
+        offsets = [tuple(self.steps[d] for d in dirs) for dirs in OPEN_DIRS]
+
+        rolls = [rng.random() for _ in range(len(cells))]
+        chases = [rng.random() < chase for _ in range(len(cells))] if chase > 0 else [False]*len(cells)
+
+        # Distances to the player, shared by every chasing enemy.  Fields are
+        # cached by source, so once the player moves this is a search of the
+        # whole maze, O(cells), on every turn in which any enemy chases,
+        # unless the player is back on one of the last few cells searched
+        player = self.paths.field(self.current_cell).dist if any(chases) else None
+        moved = []
+        for (id, cell), roll, chasing in zip(list(cells.items()), rolls, chases):
+
+            # Keep the accessible neighbors no other enemy is in, and move
+            # the enemy in the index to a randomly chosen one, or the one
+            # closest to the player if chasing
+            moves_list = [cell + o for o in offsets[walls[cell]] if cell + o not in occupants]
+            if moves_list:
+                if chasing:
+                    target = min(moves_list, key=lambda m: (player[m] < 0, player[m]))
+                else:
+                    target = moves_list[int(roll*len(moves_list))]
+                del occupants[cell]
+                occupants[target] = id
+                cells[id] = target
+                if free is not None:
+                    p = free_pos[target]
+                    free_ids[p] = cell
+                    free_pos[cell] = p
+                    free_pos[target] = -1
+                moved += (cell, target)
+
+        self.dirty.update(moved)
+        return len(moved)//2
+
     def attack(self, direction):
         """ Based on the requested direction, check if the target cell
             is accessible.  If so, attack into the cell.  Otherwise, break
@@ -89,12 +208,14 @@ class Dungeon(Maze):
         # is present in that cell.  Remove that enemy if so.  If the target
         # cell is not accessible, remove the wall between the current and
         # target cell instead.
-        if self.cell_list[self.current_cell].can_access(target) == 0:
+        if self.can_access(self.current_cell, target) == 0:
             if target in self.enemies:
                 self.enemies.remove(target)
+                self.dirty.add(target)
                 return 1
             elif target in self.rewards:
                 self.rewards.remove(target)
+                self.dirty.add(target)
                 return 2
             return -1
         else:
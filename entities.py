@@ -0,0 +1,110 @@
+### Entity index class for the dungeon
+### Date:     10/17/2026
+
+from pool import CellPool
+
+
+class EntityIndex:
+    """ The positions of one kind of entity (enemies, rewards) in a
+        dungeon, indexed both by stable entity ID and by cell ID, so that
+        lookups in either direction take constant time """
+
+    def __init__(self, cells=()):
+        """ Set up the index, placing an entity in each of the given cells.
+            Both maps are built in bulk rather than by adding the entities
+            one at a time. """
+        # Cell ID of each entity, by entity ID, the entity ID in each
+        # occupied cell, and the ID given to the next entity added
+        self.cells      = dict(enumerate(cells))
+        self.occupants  = dict(zip(self.cells.values(), self.cells))
+        self.next_id    = len(self.cells)
+
+        # Pool of the cells no entity occupies, once asked for
+        self.free       = None
+
+        if len(self.occupants) < len(self.cells):
+            raise Exception('Cells given to the index are not all distinct.')
+
+
+    def __repr__(self):
+        """ Return the entity IDs and the cells they occupy """
+        return 'EntityIndex({})'.format(self.cells)
+
+
+    def __len__(self):
+        return len(self.cells)
+
+
+    def __contains__(self, cell):
+        """ Identify whether a cell is occupied """
+        return cell in self.occupants
+
+
+    def __iter__(self):
+        """ Iterate over the occupied cells, in order of entity ID """
+        return iter(list(self.cells.values()))
+
+
+    def __getitem__(self, id):
+        """ Return the cell occupied by an entity """
+        return self.cells[id]
+
+
+    def ids(self):
+        """ Return the list of entity IDs, in the order they were added """
+        return list(self.cells)
+
+
+    def at(self, cell):
+        """ Return the ID of the entity in a cell, or None if it is empty """
+        return self.occupants.get(cell)
+
+
+    def add(self, cell):
+        """ Place a new entity in an empty cell, and return its ID """
+        if cell in self.occupants:
+            raise Exception('Cell \'{}\' is already occupied.'.format(cell))
+
+        id = self.next_id
+        self.next_id += 1
+        self.cells[id] = cell
+        self.occupants[cell] = id
+        if self.free is not None:
+            self.free.remove(cell)
+        return id
+
+
+    def remove(self, cell):
+        """ Remove the entity in a cell, and return its ID """
+        if cell not in self.occupants:
+            raise Exception('Cell \'{}\' is not occupied.'.format(cell))
+
+        id = self.occupants.pop(cell)
+        del self.cells[id]
+        if self.free is not None:
+            self.free.add(cell)
+        return id
+
+
+    def move(self, id, cell):
+        """ Move an entity to an empty cell """
+        if cell in self.occupants:
+            raise Exception('Cell \'{}\' is already occupied.'.format(cell))
+
+        if self.free is not None:
+            self.free.replace(cell, self.cells[id])
+        del self.occupants[self.cells[id]]
+        self.cells[id] = cell
+        self.occupants[cell] = id
+
+
+    def free_cells(self, size, rng=None):
+        """ Return a pool of the cells in range(size) that no entity
+            occupies, built on the first call and kept up to date as
+            entities are added, removed and moved from then on """
+
+        if self.free is None:
+            self.free = CellPool(size, rng=rng)
+            for c in self.occupants:
+                self.free.remove(c)
+        return self.free
@@ -0,0 +1,187 @@
+### Field of view and fog of war for the dungeon
+### Date:     10/17/2026
+###
+### A cell is in sight of the player if it is within the sight radius and
+### the line between the centers of the two cells, followed cell by cell,
+### only crosses open passages.  Cells once in sight stay explored: their
+### walls are drawn, but not what is in them, until they are in sight again.
+
+from collections import OrderedDict
+from cell import OPEN
+
+# Sight radius, in cells
+RADIUS = 8
+
+# Sets of cells in sight kept in the cache, by player cell
+MAX_CACHED = 1024
+
+
+class FieldOfView:
+	""" The cells in sight of the player in a dungeon, and the cells they
+		have explored.  The cells in sight from each cell are cached by
+		(cell, wall version), so that returning to a cell costs nothing
+		until a wall changes, and each turn reports only the cells which
+		came into or went out of sight. """
+
+	def __init__(self, d, radius=RADIUS):
+		""" Set the dungeon and the sight radius """
+
+		self.d        = d
+		self.radius   = radius
+		self.cache    = OrderedDict()	# Cells in sight, by (cell, wall version)
+		self.visible  = frozenset()		# Cells in sight this turn
+		self.explored = set()			# Cells ever in sight
+		self.hits     = 0
+		self.misses   = 0
+
+
+	def sight(self, cell):
+		""" Return the set of cells in sight from a cell, cached by the cell
+			and the dungeon's wall version """
+
+		key = (cell, self.d.wall_version)
+		if key in self.cache:
+			self.cache.move_to_end(key)
+			self.hits += 1
+			return self.cache[key]
+
+		self.misses += 1
+		visible = self.cast(cell)
+		self.cache[key] = visible
+		while len(self.cache) > MAX_CACHED:
+			self.cache.popitem(last=False)
+		return visible
+
+
+	def candidates(self, cell):
+		""" Return the cells within the radius reachable from a cell through
+			open passages without ever turning back along either axis, the
+			only cells a line of sight can reach """
+
+		d = self.d
+		walls, steps, width = d.walls, d.steps, d.width
+		x0, y0 = cell % width, cell // width
+		r2 = self.radius*self.radius
+
+		found = {cell}
+		for sx, sy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+
+			# Directions moving away from the cell in this quadrant
+			dirs = (1 if sx > 0 else 3, 2 if sy > 0 else 0)
+			frontier = [cell]
+			seen = {cell}
+			while frontier:
+				nxt = []
+				for c in frontier:
+					for direction in dirs:
+						if walls[c] & OPEN[direction]:
+							n = c + steps[direction]
+							dx, dy = n % width - x0, n // width - y0
+							if n not in seen and dx*dx + dy*dy <= r2:
+								seen.add(n)
+								nxt.append(n)
+				frontier = nxt
+			found |= seen
+		return found
+
+
+	def line_open(self, cell, target):
+		""" Identify whether the line between the centers of two cells only
+			crosses open passages.  Where the line passes exactly through a
+			corner, either way around it will do. """
+
+		d = self.d
+		walls, steps, width = d.walls, d.steps, d.width
+		dx = target % width - cell % width
+		dy = target // width - cell // width
+		nx, ny = abs(dx), abs(dy)
+		xdir = 1 if dx > 0 else 3
+		ydir = 2 if dy > 0 else 0
+
+		c = cell
+		ix = iy = 0
+		while ix < nx or iy < ny:
+			decision = (1 + 2*ix)*ny - (1 + 2*iy)*nx
+			if decision == 0:
+				# Through a corner: step diagonally by either side
+				xy = walls[c] & OPEN[xdir] and walls[c + steps[xdir]] & OPEN[ydir]
+				yx = walls[c] & OPEN[ydir] and walls[c + steps[ydir]] & OPEN[xdir]
+				if not (xy or yx):
+					return False
+				c += steps[xdir] + steps[ydir]
+				ix += 1
+				iy += 1
+			elif decision < 0:
+				if not walls[c] & OPEN[xdir]:
+					return False
+				c += steps[xdir]
+				ix += 1
+			else:
+				if not walls[c] & OPEN[ydir]:
+					return False
+				c += steps[ydir]
+				iy += 1
+		return True
+
+
+	def cast(self, cell):
+		""" Return the set of cells in sight from a cell """
+		return frozenset(t for t in self.candidates(cell) if self.line_open(cell, t))
+
+
+	def update(self):
+		""" Move the sight to the player's cell, marking the cells in sight
+			explored, and return the cells which came into sight and the
+			cells which went out of sight since the last update """
+
+		visible = self.sight(self.d.current_cell)
+		entered = visible - self.visible
+		left = self.visible - visible
+		self.visible = visible
+		self.explored |= entered
+		return entered, left
+
+
+	def shown(self, y, x):
+		""" Identify whether the character at row y, column x of the
+			rendered maze is drawn, which it is if it borders an explored
+			cell """
+
+		d = self.d
+		rows = ((y-1)//2, y//2) if y % 2 == 0 else (y//2,)
+		cols = ((x-1)//2, x//2) if x % 2 == 0 else (x//2,)
+		return any(r*d.width + c in self.explored for r in rows if 0 <= r < d.height
+			for c in cols if 0 <= c < d.width)
+
+
+	def mask(self, print_rows, layers, x0=0, y0=0):
+		""" Hide the parts of a rendered maze (in the form returned by
+			Maze.render or Maze.render_view, with its upper left cell at
+			(x0, y0)) not yet explored, and the contents of cells out of
+			sight, and return the rows and layers left """
+
+		d = self.d
+		width = (len(print_rows[0]) - 1)//2
+		height = (len(print_rows) - 1)//2
+
+		# Explored flags of the cells in the view and the cells around it,
+		# by row, from the column left of the view to the one right of it
+		flags = {}
+		for r in range(y0-1, y0+height+1):
+			flags[r] = [0 <= r < d.height and 0 <= c < d.width and r*d.width + c in self.explored
+				for c in range(x0-1, x0+width+1)]
+
+		rows = []
+		for y, row in enumerate(print_rows):
+			if y % 2 == 0:
+				above, below = flags[y0 + y//2 - 1], flags[y0 + y//2]
+				seen = [a or b for a, b in zip(above, below)]
+			else:
+				seen = flags[y0 + y//2]
+			rows.append(''.join(ch if (seen[x//2] or seen[x//2+1] if x % 2 == 0 else seen[x//2+1]) else ' '
+				for x, ch in enumerate(row)))
+
+		visible = self.visible
+		layers = [[(xpos, ypos, char) for xpos, ypos, char in layer
+			if (y0 + ypos//2)*d.width + x0 + xpos//2 in visible] for layer in layers]
+		return rows, layers
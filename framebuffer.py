@@ -0,0 +1,117 @@
+### Diff-based frame writer for curses
+### Date:     10/17/2026
+
+import curses
+
+# Unchanged cells of the same color a run may bridge, since rewriting a few
+# characters costs less than moving the cursor past them
+GAP = 4
+
+
+class FrameBuffer:
+	""" A stand-in for the curses window which collects each frame in a
+		grid of (character, attribute) cells instead of writing it out.
+		On refresh, the grid is compared with the frame last written, and
+		only the changed runs are written, one addstr per run of a single
+		color, followed by one doupdate.  Any other window method is passed
+		through to the window. """
+
+	def __init__(self, stdscr):
+		""" Set the window, and size the grids to it """
+
+		self.stdscr = stdscr
+		self.calls  = 0		# Calls to addstr in the last frame written
+		self.bytes  = 0		# Bytes of text in the last frame written
+		self.resize()
+
+
+	def __getattr__(self, name):
+		return getattr(self.stdscr, name)
+
+
+	def resize(self):
+		""" Size the grids to the window, and clear it, as after the
+			terminal is resized """
+
+		self.height, self.width = self.stdscr.getmaxyx()
+		self.stdscr.clear()
+		self.chars = [[' ']*self.width for _ in range(self.height)]
+		self.attrs = [[0]*self.width for _ in range(self.height)]
+		self.front_chars = [row[:] for row in self.chars]
+		self.front_attrs = [row[:] for row in self.attrs]
+
+
+	def clear(self):
+		""" Blank the frame being collected.  Unlike the window's clear,
+			the blanks are only written where the last frame was not blank. """
+
+		for row in self.chars:
+			row[:] = [' ']*self.width
+		for row in self.attrs:
+			row[:] = [0]*self.width
+
+
+	def addstr(self, y, x, text, attr=0):
+		""" Write text into the frame, clipped to the window """
+
+		if not 0 <= y < self.height or x >= self.width:
+			return
+		text = text[:self.width-x]
+		self.chars[y][x:x+len(text)] = text
+		self.attrs[y][x:x+len(text)] = [attr]*len(text)
+
+
+	def runs(self, y):
+		""" Return the changed runs of a row, as (x, text, attribute) """
+
+		chars, attrs = self.chars[y], self.attrs[y]
+		old_chars, old_attrs = self.front_chars[y], self.front_attrs[y]
+
+		runs = []
+		x = 0
+		while x < self.width:
+			if chars[x] == old_chars[x] and attrs[x] == old_attrs[x]:
+				x += 1
+				continue
+
+			# Extend the run over cells of the same color, up to a short gap
+			# of unchanged cells
+			start, attr, end = x, attrs[x], x+1
+			x += 1
+			while x < self.width and attrs[x] == attr and x - end < GAP:
+				if chars[x] != old_chars[x] or attrs[x] != old_attrs[x]:
+					end = x+1
+				x += 1
+			runs.append((start, ''.join(chars[start:end]), attr))
+			x = end
+		return runs
+
+
+	def refresh(self):
+		""" Write the changes since the last frame to the terminal """
+
+		calls = 0
+		size = 0
+		for y in range(self.height):
+			if self.chars[y] == self.front_chars[y] and self.attrs[y] == self.front_attrs[y]:
+				continue
+
+			for x, text, attr in self.runs(y):
+				# Writing the bottom right cell moves the cursor off the
+				# window, which curses reports as an error after writing
+				try:
+					self.stdscr.addstr(y, x, text, attr)
+				except curses.error:
+					pass
+				calls += 1
+				size += len(text.encode())
+
+			self.front_chars[y] = self.chars[y][:]
+			self.front_attrs[y] = self.attrs[y][:]
+
+		self.stdscr.noutrefresh()
+		curses.doupdate()
+
+		self.calls = calls
+		self.bytes = size
+		return calls
@@ -0,0 +1,244 @@
+### Maze generation algorithms for 2-D maze module
+### Date:     10/17/2026
+
+from array import array
+from cell import OPEN, OPPOSITE, OPEN_DIRS
+from seeding import make_rng
+
+# Registry of maze generation algorithms, by name.  Each takes a maze whose
+# walls are all in place and carves its passages into the maze's wall mask,
+# drawing random numbers only from the maze's own generator.
+GENERATORS = {}
+
+
+def register_generator(name):
+	""" Record the decorated function as the generator of the given name """
+
+	def register(fn):
+		GENERATORS[name] = fn
+		return fn
+	return register
+
+
+### Bulk operations on byte planes
+###
+### A byte plane is an int built from a bytes object of one 0/1 flag per
+### cell (cell i in bits 8i to 8i+7), so that whole-grid boolean logic and
+### neighbor shifts run as single big-integer operations.  Cell i's
+### neighbors above and to the right are one row's worth of bytes (8*width
+### bits) and one byte (8 bits) away in the plane.
+
+# Byte translation table making 0/1 flags from random bytes
+COIN = bytes(0 if b < 128 else 1 for b in range(256))
+
+
+def plane(flags):
+	""" Return the byte plane for a bytes-like object of 0/1 flags """
+	return int.from_bytes(flags, 'little')
+
+
+def pack_planes(n, up, right, down, left):
+	""" Combine the open-passage planes for each direction into a wall
+		mask of n cells """
+	return (up | right << 1 | down << 2 | left << 3).to_bytes(n, 'little')
+
+
+def edge_planes(width, height):
+	""" Return the full, top row, and rightmost column planes of a grid """
+
+	n = width*height
+	full = plane(b'\x01'*n)
+	top  = plane(b'\x01'*width)
+	rcol = plane((b'\x00'*(width-1) + b'\x01')*height)
+	return full, top, rcol
+
+
+### Generators
+
+@register_generator('binary_tree')
+def binary_tree(maze):
+	""" Carve each cell's passage either up or right, with the top row a
+		single corridor to the right and the rightmost column a single
+		corridor upwards.  Runs in whole-grid byte plane operations. """
+
+	n = len(maze.walls)
+	row = 8*maze.width
+	full, top, rcol = edge_planes(maze.width, maze.height)
+
+	# Flip a coin for every cell at once, then force the corridors
+	coins = plane(maze.rng.randbytes(n).translate(COIN))
+	right = (coins | top) & (full ^ rcol)
+	up    = ((full ^ coins) | rcol) & (full ^ top)
+
+	# Each passage up or right is a passage down or left from the other
+	# side, one row or one cell along
+	maze.walls[:] = pack_planes(n, up, right, up >> row, right << 8)
+	return 0
+
+
+@register_generator('sidewinder')
+def sidewinder(maze):
+	""" Carve runs of passages to the right, closing each run with one
+		passage up from a random cell in the run.  The coin flips and
+		wall mask are built in byte plane operations, and the runs are
+		closed row by row. """
+
+	n = len(maze.walls)
+	width = maze.width
+	full, top, rcol = edge_planes(width, maze.height)
+
+	# Decide every passage to the right at once
+	coins = plane(maze.rng.randbytes(n).translate(COIN))
+	right = (coins | top) & (full ^ rcol)
+	east  = right.to_bytes(n, 'little')
+
+	# For each run in the rows below the top, carve up from one cell
+	north = bytearray(n)
+	for base in range(width, n, width):
+		start = base
+		while start < base + width:
+			end = east.find(0, start, base + width)
+			north[maze.rng.randrange(start, end+1)] = 1
+			start = end + 1
+
+	up = plane(north)
+	maze.walls[:] = pack_planes(n, up, right, up >> 8*width, right << 8)
+	return 0
+
+
+@register_generator('kruskal')
+def kruskal(maze):
+	""" Remove the walls between cells in random order, whenever the cells
+		are not yet connected, tracking connections by union-find """
+
+	width = maze.width
+	walls = maze.walls
+	parent = array('i', maze.cell_ids)
+
+	def find(i):
+		while parent[i] != i:
+			parent[i] = parent[parent[i]]
+			i = parent[i]
+		return i
+
+	# Every wall to the right of or below a cell, in random order
+	edges = [(i, d) for i in maze.cell_ids for d in (1, 2) if maze.adjacency[i] & OPEN[d]]
+	maze.rng.shuffle(edges)
+
+	for i, d in edges:
+		j = i + (1 if d == 1 else width)
+		a, b = find(i), find(j)
+		if a != b:
+			parent[b] = a
+			walls[i] |= OPEN[d]
+			walls[j] |= OPEN[OPPOSITE[d]]
+	return 0
+
+
+def eller_rows(width, height=None, rng=None):
+	""" Generate a maze row by row with Eller's algorithm, keeping only a
+		row's worth of state.  Yields a pair of bytearrays for each row,
+		flagging the passages to the right of and below each cell.  With no
+		height, rows are generated indefinitely.  A generator seeded from
+		the system is used unless one is given. """
+
+	rng = rng if rng is not None else make_rng()
+
+	# Set label of each cell in the current row
+	sets = list(range(width))
+	next_set = width
+
+	row = 0
+	while height is None or row < height:
+		last = height is not None and row == height-1
+
+		# Union-find over the labels of this row
+		parent = {}
+		def find(s):
+			while s in parent:
+				s = parent[s]
+			return s
+
+		# Randomly join adjacent cells in different sets, or all of them
+		# in the last row
+		right = bytearray(width)
+		for c in range(width-1):
+			a, b = find(sets[c]), find(sets[c+1])
+			if a != b and (last or rng.random() < 0.5):
+				right[c] = 1
+				parent[b] = a
+		sets = [find(s) for s in sets]
+
+		# Carve down from at least one cell in every set, and give the
+		# cells below the others new sets
+		down = bytearray(width)
+		if not last:
+			members = {}
+			for c, s in enumerate(sets):
+				members.setdefault(s, []).append(c)
+			for cols in members.values():
+				chosen = [c for c in cols if rng.random() < 0.5] or [rng.choice(cols)]
+				for c in chosen:
+					down[c] = 1
+
+			for c in range(width):
+				if not down[c]:
+					sets[c] = next_set
+					next_set += 1
+
+		yield right, down
+		row += 1
+
+
+@register_generator('eller')
+def eller(maze):
+	""" Carve the maze row by row with Eller's algorithm, building the wall
+		mask from the collected rows in byte plane operations """
+
+	right = bytearray()
+	down  = bytearray()
+	for r, d in eller_rows(maze.width, maze.height, maze.rng):
+		right += r
+		down  += d
+
+	n = len(maze.walls)
+	right, down = plane(right), plane(down)
+	maze.walls[:] = pack_planes(n, down << 8*maze.width, right, down, right << 8)
+	return 0
+
+
+@register_generator('wilson')
+def wilson(maze):
+	""" Grow a uniform spanning tree with Wilson's algorithm, joining each
+		cell to the tree by a loop-erased random walk """
+
+	walls = maze.walls
+	steps = maze.steps
+	adjacency = maze.adjacency
+	rng = maze.rng
+
+	in_tree = bytearray(len(walls))
+	in_tree[rng.randrange(len(walls))] = 1
+
+	# Direction last taken out of each cell on the current walk
+	heading = bytearray(len(walls))
+
+	for start in maze.cell_ids:
+
+		# Walk randomly until the tree is hit, overwriting the heading of
+		# each revisited cell (which erases any loops)
+		i = start
+		while not in_tree[i]:
+			d = rng.choice(OPEN_DIRS[adjacency[i]])
+			heading[i] = d
+			i += steps[d]
+
+		# Retrace the loop-erased walk, adding it to the tree
+		i = start
+		while not in_tree[i]:
+			d = heading[i]
+			walls[i] |= OPEN[d]
+			in_tree[i] = 1
+			i += steps[d]
+			walls[i] |= OPEN[OPPOSITE[d]]
+	return 0
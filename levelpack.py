@@ -0,0 +1,394 @@
+### Level packs of dungeons pre-generated in the background
+### Date:     10/17/2026
+###
+### Usage:  python levelpack.py --levels 100 --height 20 --width 60
+###
+### Levels are keyed by (width, height, exploration, algorithm, seed) and
+### kept as save files in an on-disk cache, whose index records the order
+### in which they were last used, whether each has been played yet, and
+### the size of the cache.  Played levels are evicted before unplayed ones.
+### Where there is no disk to cache on, levels are kept in memory instead.
+
+import os
+import sys
+import json
+import random
+import argparse
+from collections import OrderedDict
+from multiprocessing import Pool
+from dungeon import Dungeon
+from savefile import pack_dungeon, unpack_dungeon
+from seeding import make_rng
+from session import GameSession, make_new_dungeon, EXPLORATION, ALGORITHM, CHASE
+
+# Where levels are cached, and how many to keep
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.terminal_dungeon', 'levels')
+MAX_LEVELS = 256
+
+
+def level_name(key):
+	""" Return the file name of the level with the given key """
+	return '{}x{}_{}_{}_{}.tdg'.format(*key)
+
+
+def level_key(name):
+	""" Return the key of the level with the given file name, or None if
+		it is not the name of a level """
+
+	try:
+		size, rest = name[:-len('.tdg')].split('_', 1)
+		rest, seed = rest.rsplit('_', 1)
+		exploration, algorithm = rest.split('_', 1)
+		width, height = size.split('x')
+		return int(width), int(height), float(exploration), algorithm, int(seed)
+	except ValueError:
+		return None
+
+
+def generate_level(job):
+	""" Generate the level with the given key, as GameSession would from
+		its seed, and write it to the given path.  The file is written
+		under a temporary name first, so a level is never seen half done.
+		Return the key, and the bytes of the save if there is no path. """
+
+	key, path = job
+	width, height, exploration, algorithm, seed = key
+
+	d, moves, attacks, enemies, score, done_status = \
+		make_new_dungeon(height, width, exploration, algorithm, rng=make_rng(seed, 'level'))
+
+	if path is None:
+		return key, pack_dungeon(d, moves, attacks, score, done_status)
+
+	d.save(path + '.tmp', moves, attacks, score, done_status)
+	os.replace(path + '.tmp', path)
+	return key, None
+
+
+class LevelCache:
+	""" An on-disk cache of level save files, with an index kept in least
+		to most recently used order.  Only the index is read up front;
+		levels are memory-mapped as they are loaded. """
+
+	def __init__(self, directory=CACHE_DIR, max_levels=MAX_LEVELS):
+		""" Set the cache directory and size, read the index, and remove
+			any files the index does not hold.  The size is never less than
+			the size recorded in the index, so that opening a cache filled
+			by the command line with a smaller size does not evict the
+			levels it pre-generated. """
+
+		self.directory  = directory
+		self.max_levels = max_levels
+		self.index      = OrderedDict()		# Whether played, by key
+
+		os.makedirs(directory, exist_ok=True)
+		self.index_path = os.path.join(directory, 'index.json')
+		try:
+			with open(self.index_path) as f:
+				record = json.load(f)
+			self.max_levels = max(max_levels, record['max_levels'])
+			for *key, played in record['levels']:
+				if os.path.exists(self.path(tuple(key))):
+					self.index[tuple(key)] = played
+		except FileNotFoundError:
+			self.rebuild_index()
+		except (ValueError, KeyError, TypeError):
+			# A damaged index: make a new one from the levels on disk
+			self.index.clear()
+			self.rebuild_index()
+
+		# Levels finished after the index was last written, and files left
+		# half written, are not in the index and would never be evicted
+		for name in os.listdir(directory):
+			if name.endswith(('.tdg', '.tmp')) and level_key(name) not in self.index:
+				os.remove(os.path.join(directory, name))
+
+
+	def __len__(self):
+		return len(self.index)
+
+
+	def __contains__(self, key):
+		return key in self.index
+
+
+	def path(self, key):
+		""" Return the path of the save file of a level """
+		return os.path.join(self.directory, level_name(key))
+
+
+	def rebuild_index(self):
+		""" Index the levels on disk, oldest first.  Whether they were
+			played is not known, so they are counted as played, to be
+			evicted first and never served as fresh levels. """
+
+		levels = []
+		for name in os.listdir(self.directory):
+			key = level_key(name) if name.endswith('.tdg') else None
+			if key is not None:
+				levels.append((os.path.getmtime(os.path.join(self.directory, name)), key))
+		for _, key in sorted(levels):
+			self.index[key] = True
+		self.max_levels = max(self.max_levels, len(self.index))
+		if self.index:
+			self.write_index()
+
+
+	def evict(self):
+		""" Return the levels to evict to bring the cache down to its
+			size, removing them from the index: the least recently used
+			played levels, and only then unplayed levels """
+
+		excess = len(self.index) - self.max_levels
+		if excess <= 0:
+			return []
+		played = [key for key, p in self.index.items() if p]
+		unplayed = [key for key, p in self.index.items() if not p]
+		evicted = (played + unplayed)[:excess]
+		for key in evicted:
+			del self.index[key]
+		return evicted
+
+
+	def add(self, key, data=None, played=False):
+		""" Record a newly written level as the most recently used, and
+			evict levels beyond the cache size """
+
+		self.index[key] = played
+		self.index.move_to_end(key)
+		for old in self.evict():
+			if os.path.exists(self.path(old)):
+				os.remove(self.path(old))
+		self.write_index()
+
+
+	def load(self, key):
+		""" Load a cached level, marking it played and most recently used,
+			and return its game state in the form made by make_new_dungeon """
+
+		state = Dungeon.load(self.path(key))
+		self.add(key, played=True)
+		return state
+
+
+	def played(self, key):
+		""" Identify whether a level is cached and has been played """
+		return self.index.get(key, False)
+
+
+	def fresh(self, width, height, exploration, algorithm):
+		""" Return the key of the least recently used level of the given
+			kind which has not been played, or None if there is none """
+
+		for key, played in self.index.items():
+			if not played and key[:4] == (width, height, exploration, algorithm):
+				return key
+		return None
+
+
+	def write_index(self):
+		""" Write the index, replacing the old one in a single step """
+
+		with open(self.index_path + '.tmp', 'w') as f:
+			json.dump({'max_levels': self.max_levels,
+				'levels': [list(key) + [played] for key, played in self.index.items()]}, f)
+		os.replace(self.index_path + '.tmp', self.index_path)
+
+
+class MemoryCache(LevelCache):
+	""" A level cache held in memory, keeping the save of each level as
+		bytes, for use where there is no disk to cache on """
+
+	def __init__(self, max_levels=MAX_LEVELS):
+		""" Set the cache size """
+
+		self.max_levels = max_levels
+		self.index      = OrderedDict()		# Whether played, by key
+		self.data       = {}				# Bytes of the save, by key
+
+
+	def path(self, key):
+		""" Levels have no path, so workers return their bytes instead """
+		return None
+
+
+	def add(self, key, data=None, played=False):
+		""" Record a level as the most recently used, keeping its bytes if
+			given, and evict levels beyond the cache size """
+
+		if data is not None:
+			self.data[key] = data
+		self.index[key] = played
+		self.index.move_to_end(key)
+		for old in self.evict():
+			del self.data[old]
+
+
+	def load(self, key):
+		""" Load a cached level, marking it played and most recently used,
+			and return its game state in the form made by make_new_dungeon """
+
+		state = unpack_dungeon(Dungeon, self.data[key])
+		self.add(key, played=True)
+		return state
+
+
+def default_cache():
+	""" Return the level cache in the default directory, or a cache in
+		memory if the directory cannot be used """
+
+	try:
+		return LevelCache()
+	except OSError:
+		return MemoryCache()
+
+
+class LevelPack:
+	""" A supply of levels of one kind, served from the cache and kept
+		topped up by a pool of processes generating the next levels in
+		the background.  A level missing from the cache is generated in
+		this process instead. """
+
+	def __init__(self, height, width, exploration=EXPLORATION, algorithm=ALGORITHM,
+			seed=None, ahead=4, processes=None, cache=None):
+		""" Set the kind of level, the seed of the first level (random if
+			not given), the number of levels to generate ahead, the number
+			of processes generating them (by default one per level ahead,
+			up to one per CPU), and the cache, and start generating """
+
+		self.height      = height
+		self.width       = width
+		self.exploration = exploration
+		self.algorithm   = algorithm
+		self.seed        = random.randrange(2**31) if seed is None else seed
+		self.ahead       = ahead
+		self.cache       = cache if cache is not None else default_cache()
+
+		# No more processes than levels to generate ahead, as the rest
+		# would sit idle, each holding its own copy of the game's modules
+		if processes is None:
+			processes = max(1, min(ahead, os.cpu_count() or 1))
+		self.pool    = Pool(processes)
+		self.pending = {}		# Result of each level being generated, by key
+		self.prefetch()
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *args):
+		self.close()
+
+
+	def key(self, seed):
+		""" Return the cache key of the level with the given seed """
+		return (self.width, self.height, self.exploration, self.algorithm, seed)
+
+
+	def collect(self):
+		""" Add every finished level to the cache """
+
+		for key, result in list(self.pending.items()):
+			if result.ready():
+				del self.pending[key]
+				if result.successful():
+					self.cache.add(*result.get())
+
+
+	def skip_played(self):
+		""" Move the next seed past any levels already played """
+		while self.cache.played(self.key(self.seed)):
+			self.seed += 1
+
+
+	def prefetch(self):
+		""" Start generating the next levels not already cached or being
+			generated, up to the number to generate ahead """
+
+		self.collect()
+		self.skip_played()
+		for seed in range(self.seed, self.seed + self.ahead):
+			key = self.key(seed)
+			if key not in self.cache and key not in self.pending:
+				self.pending[key] = self.pool.apply_async(generate_level, ((key, self.cache.path(key)),))
+
+
+	def next_state(self):
+		""" Return the key and game state of the next level, preferring a
+			level pre-generated earlier which has not been played """
+
+		self.collect()
+		key = self.cache.fresh(self.width, self.height, self.exploration, self.algorithm)
+
+		if key is None:
+			self.skip_played()
+			key = self.key(self.seed)
+			self.seed += 1
+
+			# Wait for a level already being generated, or generate it here
+			if key in self.pending:
+				self.cache.add(*self.pending.pop(key).get())
+			elif key not in self.cache:
+				self.cache.add(*generate_level((key, self.cache.path(key))))
+
+		state = self.cache.load(key)
+		self.prefetch()
+		return key, state
+
+
+	def resize(self, height, width):
+		""" Change the size of the levels to supply, as when the terminal
+			is resized, and start generating levels of the new size.  Levels
+			of the old size still being generated are cached when done. """
+
+		self.height = height
+		self.width  = width
+		self.prefetch()
+
+
+	def next_session(self, chase=CHASE):
+		""" Start a game session on the next level, with the seed and
+			parameters it was generated from, so that it can be replayed """
+
+		key, state = self.next_state()
+		width, height, exploration, algorithm, seed = key
+		return GameSession(height, width, seed, chase, state,
+			exploration=exploration, algorithm=algorithm)
+
+
+	def close(self):
+		""" Stop generating levels, adding those finished to the cache """
+		self.collect()
+		self.pool.terminate()
+		self.pool.join()
+
+
+def main(argv):
+
+	parser = argparse.ArgumentParser(description='Pre-generate a pack of dungeon levels.')
+	parser.add_argument('--levels', type=int, default=100)
+	parser.add_argument('--height', type=int, default=20)
+	parser.add_argument('--width', type=int, default=60)
+	parser.add_argument('--exploration', type=float, default=EXPLORATION)
+	parser.add_argument('--algorithm', default=ALGORITHM)
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--processes', type=int, default=None)
+	parser.add_argument('--cache-dir', default=CACHE_DIR)
+	parser.add_argument('--max-levels', type=int, default=MAX_LEVELS)
+	args = parser.parse_args(argv)
+
+	cache = LevelCache(args.cache_dir, max(args.max_levels, args.levels))
+	keys = [(args.width, args.height, args.exploration, args.algorithm, seed)
+		for seed in range(args.seed, args.seed + args.levels)]
+	jobs = [(key, cache.path(key)) for key in keys if key not in cache]
+
+	with Pool(args.processes) as pool:
+		for key, data in pool.imap_unordered(generate_level, jobs):
+			cache.add(key)
+
+	print('{} levels cached in {}'.format(len(cache), args.cache_dir))
+
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -1,94 +1,62 @@
 import os
+import sys
 import curses
-from dungeon import Dungeon
-
-# Game parameters
-EXPLORATION = 0.5
-
-
-def make_new_dungeon(height, width):
-	""" Generate a new Dungeon object, populate it, and return game state """
-
-	enemies = int(height*width*0.1)
-	rewards = max(int(height*width*0.01), 2)
-	attacks = max(5,int(enemies * 0.25))
-
-	# Make and populate dungeon
-	d = Dungeon(width, height, EXPLORATION)
-	d.make_maze()
-	d.make_enemies(enemies)
-	d.make_rewards(rewards)
-
-	# Make game state
-	moves = 0
-	score = 0
-	done_status = False
-
-	return d, moves, attacks, enemies, score, done_status
-
-
-def render_layers(stdscr, layers_data, cx, cy, movement=False):
-
-	for i, l in enumerate(layers_data):
-		for c in l:
-			xpos = c[0] + cx
-			ypos = c[1] + cy
-			char = c[2]
-			stdscr.addstr(ypos, xpos, char, curses.color_pair(i+2))
-
-
-def key_response(stdscr, d, dirmap, atkmap, enemies, attacks, done_status):
+import asyncio
+import argparse
+from session import CHASE, DIRMAP, ATKMAP
+from renderer import RenderCache, FogRenderer, ViewportRenderer
+from fov import FieldOfView
+from world import World
+from levelpack import LevelPack
+from replay import Replay, ReplayLog
+from profiler import FrameProfiler
+from framebuffer import FrameBuffer
+
+# Names of the directions, for hints
+DIRNAMES = ['up', 'right', 'down', 'left']
+
+# Timing of the game in real time, in seconds: the interval between moves
+# of the enemies, the shortest interval between frames, the longest wait
+# for input before looking for a resize, and the interval between checks
+# for levels finished in the background
+TICK = 0.5
+FRAME = 1/60
+POLL = 0.1
+BACKGROUND = 0.25
+
+
+def key_response(stdscr, session, replay=None, profiler=None):
+	""" Wait for a key, and either play it as the next turn of the game
+		session (recording it in the replay, if any) or report a request
+		to quit, reset, or show a hint, or a resize of the terminal """
 
 	# Wait for input
 	c = stdscr.getkey()
-	dscore = 0
-
-	# Designate defaults
-	quit_status = False
-	reset_status = False
+	if profiler is not None:
+		profiler.mark('input')
 
-	# If the input matches a control character, respond appropriately
-	if c in dirmap.keys() and not done_status:
+	# Quit if 'q' is pressed, reset if 'r' is pressed, and show the way
+	# towards the goal if 'h' is pressed
+	quit_status = c == 'q' or c == 'Q'
+	reset_status = c == 'r' or c == 'R'
+	hint_status = c == 'h' or c == 'H'
+	resize_status = c == 'KEY_RESIZE'
 
-		# Attempt to move the character
-		d.move(dirmap[c])
-		dscore = 1
+	# Otherwise attempt to move or attack, and let the turn pass (a hint
+	# is free, as it is in real time)
+	if not quit_status and not reset_status and not hint_status and not resize_status:
+		session.step(c)
+		if replay is not None:
+			replay.record(c)
+		if profiler is not None:
+			profiler.mark('turn')
 
-	elif c in atkmap.keys() and not done_status:
+	return quit_status, reset_status, hint_status, resize_status
 
-		# Attempt to attack an enemy or break wall, if the character
-		# has attacks left to make
-		if attacks > 0:
-			result = d.attack(atkmap[c])
 
-			# If the attack resulted in a killed enemy,
-			# record the change in game state
-			if result == 1:
-				enemies -= 1
-				dscore = 10
-			elif result == 2:
-				dscore = 50
-
-			# Remove one available attack
-			attacks -= 1
-
-		else:
-			dscore = -1
-
-	elif c == 'q' or c == 'Q':
-
-		# Quit if 'q' is pressed
-		quit_status = True
-
-	elif c == 'r' or c == 'R':
-
-		# Reset if 'r' is pressed
-		reset_status = True
-
-	return enemies, attacks, dscore, quit_status, reset_status
-
-
-def main(stdscr):
+def setup_curses(stdscr):
+	""" Set up curses and the color pairs, and check that the window is
+		large enough to play in """
 
 	# Set up curses
 	curses.curs_set(False)
@@ -104,10 +72,6 @@ def main(stdscr):
 	curses.init_pair(3, enemy, bkgd) # Enemies
 	curses.init_pair(4, agent, bkgd) # Player/Target
 
-	# Set up controls
-	dirmap = {'w':0, 'a':3, 's':2, 'd':1}
-	atkmap = {'W':0, 'A':3, 'S':2, 'D':1}
-
 	# Set up size information
 	height, width = stdscr.getmaxyx()
 
@@ -118,13 +82,104 @@ def main(stdscr):
 		stdscr.getkey()
 		quit()
 
+	return height, width
+
+
+def make_renderer(stdscr, d, dheight, dwidth, fov=None):
+	""" Return a renderer drawing the whole dungeon if it fits in the
+		space for it, or a view following the player otherwise, under
+		fog of war if given the player's field of view """
+
+	if d.height <= dheight and d.width <= dwidth:
+		return RenderCache(stdscr, d, 1, 1) if fov is None else FogRenderer(stdscr, d, 1, 1, fov)
+	return ViewportRenderer(stdscr, d, 1, 1, min(dwidth, d.width), min(dheight, d.height),
+		bounds=(d.width, d.height), fov=fov)
+
+
+def draw_frame(stdscr, session, cache, dby, width, hint_status, profiler):
+	""" Draw the maze and the panel beneath it for the current state of a
+		game session, with a hint if requested and, if profiling, the frame
+		times beside the panel """
+
+	d, moves, attacks, enemies, score, done_status = session.state()
+
+	# Report death or completion
+	if session.died:
+		stdscr.addstr(dby+7,0,'You died!')
+
+	if session.completed:
+		if session.finish_score > 0:
+			finish_score_message = 'Well done!'
+		else:
+			finish_score_message = 'Try moving faster next time...'
+
+		stdscr.addstr(dby+7,0,'Congratulations!  Dungeon complete in {} moves.'.format(moves))
+		stdscr.addstr(dby+8,0,'Bonus score: {} {}'.format(session.finish_score, finish_score_message))
+
+	# Render the maze, redrawing only the cells that have changed
+	# since the last frame (or the view around the player)
+	profiler.mark('panel')
+	cache.draw()
+	profiler.mark('render')
+
+	stdscr.addstr(dby+2,0,'[wasd] to move.               | Moves:        {:<4}'.format(moves))
+	stdscr.addstr(dby+3,0,'Shift+[wasd] to attack.       | Attacks left: {:<4}'.format(attacks))
+	stdscr.addstr(dby+4,0,'[r] to reset, [q] to quit.    | Enemies left: {:<4}'.format(enemies))
+	stdscr.addstr(dby+5,0,'Goal: Reach the bottom right. | Score:        {:<4}'.format(score))
+
+	# Show a hint if requested, or how to ask for one
+	if hint_status and not done_status:
+		hint = d.hint()
+		stdscr.addstr(dby+6,0,'Hint: move {:<19}'.format(DIRNAMES[hint] if hint != -1 else 'nowhere'))
+	else:
+		stdscr.addstr(dby+6,0,'[h] for a hint.{:<15}'.format(''))
+
+	# Show frame times beside the panel, if profiling and there is room
+	hud = profiler.hud()
+	if hud:
+		hud.append('Output: {:>5} calls, {:>6} B'.format(stdscr.calls, stdscr.bytes))
+	if hud and width >= 52 + max(len(line) for line in hud):
+		for i, line in enumerate(hud):
+			stdscr.addstr(dby+2+i,52,line)
+	profiler.mark('panel')
+
+
+def main(stdscr, board=None, profile=None, fog=False, trace=False):
+	""" Play the dungeon crawler, on levels sized to the window or, if a
+		board size (width, height) is given, on levels of that size seen
+		through a view that follows the player, under fog of war if fog
+		is set.  If a profile prefix is given, time each phase of every
+		frame (tracing the game with cProfile too if trace is set), and
+		return the paths of the profiles written on quit. """
+
+	# Set up curses and size information
+	height, width = setup_curses(stdscr)
+
+	# Collect each frame, and write only what changed since the last
+	stdscr = FrameBuffer(stdscr)
+
 	dheight = (height-10)//2
 	dwidth  = (width-3)//2
 
-	dby = dheight * 2 + 1
+	# Supply of levels, generated ahead in the background so that a reset
+	# only has to load the next one, already built for the board size
+	bwidth, bheight = board if board is not None else (dwidth, dheight)
+	pack = LevelPack(bheight, bwidth)
+
+	# Log of every game played, to be replayed headlessly (if the log
+	# cannot be opened, the games are not logged)
+	try:
+		replay_log = ReplayLog()
+	except OSError:
+		replay_log = None
+	replay = None
+
+	# Timing of each phase of the frame, if enabled
+	profiler = FrameProfiler.from_env(profile, trace)
 
 	# Cue to reset the game
 	reset_status = True
+	hint_status = False
 
 	# Begin event loop
 	while True:
@@ -132,67 +187,342 @@ def main(stdscr):
 		# Set up game state
 		if reset_status:
 			reset_status = False
-			d, moves, attacks, enemies, score, done_status = make_new_dungeon(dheight, dwidth)
-
-			stdscr.addstr(dby+7,0,' '*59)
-			stdscr.addstr(dby+8,0,' '*59)
-
-		# Move each of the enemies (assuming the player has already
-		# moved at least once, to prevent insta-deaths)
-		if moves > 0 and not done_status:
-			for i in range(enemies):
-				d.move_enemy(i)
-
-		# Check for death
-		if d.current_cell in d.enemies:
-			stdscr.addstr(dby+7,0,'You died!')
-			score -= 100 if not done_status else 0
-			done_status = True
-
-		# Check for completion
-		if d.current_cell == d.cell_ids[-1]:
-			finish_score = dheight*dwidth - moves
-			if finish_score > 0:
-				finish_score_message = 'Well done!'
-			else:
-				finish_score_message = 'Try moving faster next time...'
-
-			stdscr.addstr(dby+7,0,'Congratulations!  Dungeon complete in {} moves.'.format(moves))
-			stdscr.addstr(dby+8,0,'Bonus score: {} {}'.format(finish_score, finish_score_message))
-			score += finish_score if not done_status else 0
-			done_status = True
-		
-		# Obtain dungeon render
-		layer0, layers = d.render()
-		corner_x = 1
-		corner_y = 1
+			if replay_log is not None and replay is not None:
+				replay_log.write(replay, session)
+			session = pack.next_session(CHASE)
+			replay = Replay.of(session)
+			fov = FieldOfView(session.d) if fog else None
+			cache = make_renderer(stdscr, session.d, dheight, dwidth, fov)
+			profiler.wrap(session.d, 'step_enemies', 'enemies', 'turn')
 
-		# Render the maze
-		for i, l in enumerate(layer0):
-			stdscr.addstr(corner_y+i,corner_x, l, curses.color_pair(1))
+			stdscr.clear()
+			dby = min(session.d.height, dheight) * 2 + 1
+			profiler.mark('reset')
 
-		render_layers(stdscr, layers, corner_x, corner_y)
-
-		stdscr.addstr(dby+2,0,'[wasd] to move.               | Moves:        {:<4}'.format(moves))
-		stdscr.addstr(dby+3,0,'Shift+[wasd] to attack.       | Attacks left: {:<4}'.format(attacks))
-		stdscr.addstr(dby+4,0,'[r] to reset, [q] to quit.    | Enemies left: {:<4}'.format(enemies))
-		stdscr.addstr(dby+5,0,'Goal: Reach the bottom right. | Score:        {:<4}'.format(score))
+		draw_frame(stdscr, session, cache, dby, width, hint_status, profiler)
 
 		# Refresh the screen
 		stdscr.refresh()
+		profiler.mark('refresh')
 
 		# Respond to key input
-		enemies, attacks, dscore, quit_status, reset_status = \
-			key_response(stdscr, d, dirmap, atkmap, enemies, attacks, done_status)
-		score += dscore
+		quit_status, reset_status, hint_status, resize_status = key_response(stdscr, session, replay, profiler)
+		profiler.end_frame()
+
+		# On a resize, start generating levels for the new size and move
+		# on to one at once if the current level no longer fits, or, with
+		# a fixed board size, resize the view onto the board
+		if resize_status:
+			height, width = stdscr.getmaxyx()
+			if height >= 14 and width >= 60:
+				dheight = (height-10)//2
+				dwidth  = (width-3)//2
+				if board is None:
+					pack.resize(dheight, dwidth)
+					reset_status = dheight < session.d.height or dwidth < session.d.width
+
+			stdscr.resize()
+			cache = make_renderer(stdscr, session.d, dheight, dwidth, fov)
+			dby = min(session.d.height, dheight) * 2 + 1
 
 		# Quit if requested
 		if quit_status:
 			break
 
-		# Iterate the move counter and go back to the start of the loop
-		moves += 1 if not done_status else 0
+	pack.close()
+	if replay_log is not None:
+		replay_log.write(replay, session)
+		replay_log.close()
+
+	return profiler.dump()
+
+
+def coalesce(keys):
+	""" Return the keys read since the last frame, with each run of one key
+		reduced to a single key, so that a key held down moves once a frame
+		instead of queueing up moves the frames cannot keep up with """
+	return [c for i, c in enumerate(keys) if i == 0 or c != keys[i-1]]
+
+
+class RealtimeGame:
+	""" The dungeon crawler played in real time: the enemies move on a
+		fixed clock whether or not the player moves, and the player's keys
+		are played as soon as they are read.  Reading input, moving the
+		enemies, drawing frames, and collecting levels generated in the
+		background each run as their own task on one asyncio event loop,
+		which wakes each only when it has something to do. """
+
+	def __init__(self, stdscr, board=None, tick=TICK, profile=None, fog=False, trace=False):
+		""" Set up the window and the supply of levels, as in main, and the
+			interval between moves of the enemies """
+
+		self.height, self.width = setup_curses(stdscr)
+		stdscr.nodelay(True)
+		self.stdscr = FrameBuffer(stdscr)
+
+		self.board = board
+		self.tick  = tick
+		self.fog   = fog
+		self.dheight = (self.height-10)//2
+		self.dwidth  = (self.width-3)//2
+
+		bwidth, bheight = board if board is not None else (self.dwidth, self.dheight)
+		self.pack = LevelPack(bheight, bwidth)
+
+		try:
+			self.replay_log = ReplayLog()
+		except OSError:
+			self.replay_log = None
+		self.replay = None
+		self.session = None
+
+		self.profiler = FrameProfiler.from_env(profile, trace)
+		self.hint_status = False
+
+		# Set when input is waiting to be read, and when the frame on
+		# screen is out of date
+		self.readable = asyncio.Event()
+		self.dirty = asyncio.Event()
+
+
+	def reset(self):
+		""" Log the game played so far, and start the next level """
+
+		if self.replay_log is not None and self.replay is not None:
+			self.replay_log.write(self.replay, self.session)
+
+		self.session = self.pack.next_session(CHASE)
+		self.replay = Replay.of(self.session, realtime=True)
+		self.fov = FieldOfView(self.session.d) if self.fog else None
+		self.profiler.wrap(self.session.d, 'step_enemies', 'enemies', 'turn')
+		self.layout()
+
+
+	def layout(self):
+		""" Size the frame and the renderer to the window and the level """
+
+		self.stdscr.resize()
+		self.cache = make_renderer(self.stdscr, self.session.d, self.dheight, self.dwidth, self.fov)
+		self.dby = min(self.session.d.height, self.dheight) * 2 + 1
+		self.dirty.set()
+
+
+	def resize(self):
+		""" Respond to a resize of the terminal, as in main """
+
+		self.height, self.width = self.stdscr.getmaxyx()
+		if self.height >= 14 and self.width >= 60:
+			self.dheight = (self.height-10)//2
+			self.dwidth  = (self.width-3)//2
+			if self.board is None:
+				self.pack.resize(self.dheight, self.dwidth)
+				if self.dheight < self.session.d.height or self.dwidth < self.session.d.width:
+					self.reset()
+					return
+		self.layout()
+
+
+	def play(self, keys):
+		""" Play the keys read since the last frame, returning True if the
+			player asked to quit """
+
+		for c in coalesce(keys):
+			if c == 'q' or c == 'Q':
+				return True
+			elif c == 'r' or c == 'R':
+				self.reset()
+			elif c == 'KEY_RESIZE':
+				self.resize()
+			else:
+				self.hint_status = c == 'h' or c == 'H'
+				if not self.hint_status:
+					self.session.act(c)
+					self.replay.record(c)
+		self.profiler.mark('turn')
+		self.dirty.set()
+		return False
+
+
+	async def read_input(self):
+		""" Read every key waiting whenever the terminal has input, or
+			at least every POLL seconds, as curses reports a resize as a
+			key without any input to read, until the player quits """
+
+		while True:
+			try:
+				await asyncio.wait_for(self.readable.wait(), POLL)
+			except asyncio.TimeoutError:
+				pass
+			self.readable.clear()
+
+			keys = []
+			while True:
+				try:
+					keys.append(self.stdscr.getkey())
+				except curses.error:
+					break
+
+			if keys:
+				self.profiler.mark('input')
+				if self.play(keys):
+					return
+
+
+	async def move_enemies(self):
+		""" Move the enemies every tick, keeping to a fixed rate however
+			long each move and the frames in between take """
+
+		loop = asyncio.get_running_loop()
+		deadline = loop.time()
+		while True:
+			deadline += self.tick
+			await asyncio.sleep(max(0, deadline - loop.time()))
+
+			# The enemies only move once the player has, as in step
+			session = self.session
+			if session.moves > 0 and not session.done_status:
+				session.advance()
+				self.replay.record_tick()
+				self.dirty.set()
+
+
+	async def draw(self):
+		""" Draw a frame whenever the one on screen is out of date, at most
+			once every FRAME seconds """
+
+		while True:
+			await self.dirty.wait()
+			self.dirty.clear()
+			self.profiler.mark('input')
+
+			draw_frame(self.stdscr, self.session, self.cache, self.dby, self.width,
+				self.hint_status, self.profiler)
+			self.stdscr.refresh()
+			self.profiler.mark('refresh')
+			self.profiler.end_frame()
+
+			await asyncio.sleep(FRAME)
+
+
+	async def collect(self):
+		""" Add levels finished in the background to the cache, and keep
+			generating ahead, between frames """
+
+		while True:
+			await asyncio.sleep(BACKGROUND)
+			self.pack.collect()
+			self.pack.prefetch()
+
+
+	async def run(self):
+		""" Play until the player quits, then close the supply of levels
+			and the replay log, and return the paths of any profiles """
+
+		loop = asyncio.get_running_loop()
+		loop.add_reader(sys.stdin.fileno(), self.readable.set)
+		self.reset()
+
+		tasks = [asyncio.ensure_future(task) for task in
+			(self.move_enemies(), self.draw(), self.collect())]
+		try:
+			await self.read_input()
+		finally:
+			loop.remove_reader(sys.stdin.fileno())
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+
+		self.pack.close()
+		if self.replay_log is not None:
+			self.replay_log.write(self.replay, self.session)
+			self.replay_log.close()
+
+		return self.profiler.dump()
+
+
+def realtime_main(stdscr, board=None, tick=TICK, profile=None, fog=False, trace=False):
+	""" Play the dungeon crawler in real time, with the enemies moving
+		every tick seconds """
+	return asyncio.run(RealtimeGame(stdscr, board, tick, profile, fog, trace).run())
+
+
+def world_main(stdscr):
+	""" Explore an unbounded world, generated chunk by chunk along the
+		way, with the view scrolling to follow the player """
+
+	# Set up curses and size information
+	height, width = setup_curses(stdscr)
+	stdscr = FrameBuffer(stdscr)
+
+	vheight = (height-8)//2
+	vwidth  = (width-3)//2
+
+	dby = vheight * 2 + 1
+
+	world = World(view=(vwidth, vheight))
+	view = ViewportRenderer(stdscr, world, 1, 1, vwidth, vheight)
+
+	moves = 0
+	attacks = 10
+	score = 0
+
+	# Begin event loop
+	while True:
+
+		# Render the view around the player
+		view.draw()
+
+		stdscr.addstr(dby+2,0,'[wasd] to move.               | Position:     {:<14}'.format('{}, {}'.format(*world.player)))
+		stdscr.addstr(dby+3,0,'Shift+[wasd] to attack.       | Attacks left: {:<4}'.format(attacks))
+		stdscr.addstr(dby+4,0,'[q] to quit.                  | Score:        {:<4}'.format(score))
+		stdscr.addstr(dby+5,0,'Explore as far as you like.   | Chunks held:  {:<4}'.format(len(world.chunks)))
+
+		# Refresh the screen
+		stdscr.refresh()
+
+		# Respond to key input, quitting if 'q' is pressed
+		c = stdscr.getkey()
+		if c == 'q' or c == 'Q':
+			break
+
+		if c in DIRMAP:
+			world.move(DIRMAP[c])
+			moves += 1
+			score += 1
+
+		# Each reward taken gives more attacks, to keep breaking through
+		elif c in ATKMAP and attacks > 0:
+			attacks -= 1
+			if world.attack(ATKMAP[c]) == 2:
+				score += 50
+				attacks += 5
+
+	world.close()
 
 if __name__ == '__main__':
-	curses.wrapper(main)
+
+	parser = argparse.ArgumentParser(description='A small, terminal-based dungeon crawler.')
+	parser.add_argument('--world', action='store_true', help='explore an unbounded world')
+	parser.add_argument('--size', help='board size as WIDTHxHEIGHT, which may be larger than the window')
+	parser.add_argument('--realtime', nargs='?', type=float, const=TICK, metavar='TICK',
+		help='play in real time, with the enemies moving every TICK seconds')
+	parser.add_argument('--fog', action='store_true', help='show only what the player can see and has seen')
+	parser.add_argument('--profile', nargs='?', const='frame_profile', metavar='PREFIX',
+		help='time each phase of the frame, writing PREFIX.txt on quit')
+	parser.add_argument('--trace', action='store_true',
+		help='with --profile, also write a cProfile trace of the game to PREFIX.prof (slows every frame)')
+	args = parser.parse_args()
+
+	board = tuple(int(n) for n in args.size.split('x')) if args.size else None
+
+	if args.world:
+		curses.wrapper(world_main)
+	elif args.realtime is not None:
+		paths = curses.wrapper(realtime_main, board, args.realtime, args.profile, args.fog, args.trace)
+	else:
+		paths = curses.wrapper(main, board, args.profile, args.fog, args.trace)
+
+	if not args.world:
+		for path in paths:
+			print('Profile written to {}'.format(path))
 	curses.endwin()
\ No newline at end of file
@@ -2,9 +2,12 @@
 ### Author:   gdgrant
 ### Date:     11/6/2018
 
-import copy
+import gc
 import random
-from cell import Cell
+from cell import Cell, CellViewList, OPEN, OPPOSITE, OPEN_DIRS, NONE
+from pool import CellPool
+from pathfinding import Pathfinder
+from generators import GENERATORS, register_generator
 
 # All the characters used for rendering the maze
 char_dict = {
@@ -26,147 +29,271 @@ char_dict = {
 	15  : '┼',
 }
 
+# Byte translation tables giving, from each cell's wall mask, a 0/1 flag
+# for whether there is a wall in each direction
+WALL_FLAG = tuple(bytes(0 if m & OPEN[d] else 1 for m in range(256)) for d in range(4))
+
+# Text for each junction pattern followed by the wall to its right, and for
+# each vertical wall flag followed by an empty cell
+JUNCTION_TEXT = {p: char_dict[p] + ('─' if p & 1 else ' ') for p in range(16)}
+CELL_TEXT = {0: '  ', 1: '│ '}
+
+def render_walls(walls, width, height, open_edges=False):
+	""" Return the rows of characters drawing the walls of a maze from its
+		wall mask, with every cell empty.  The right and bottom edges are
+		drawn closed, unless open_edges is set (for a view into a larger
+		maze), in which case they follow the walls of the cells beside
+		them. """
+
+	# Wall flags along the bottom of the previous row of cells, and
+	# beside each junction of the previous row (none above the maze)
+	above = bytes(width+1)
+	print_rows = []
+	for row in range(height+1):
+
+		# Get the 0/1 flags for the walls on top of each cell in this
+		# row, and to the left of each cell plus the rightmost wall
+		if row < height:
+			cells = walls[row*width:(row+1)*width]
+			horiz = cells.translate(WALL_FLAG[0])
+			vert  = cells.translate(WALL_FLAG[3]) \
+				+ (cells[-1:].translate(WALL_FLAG[1]) if open_edges else b'\x01')
+		else:
+			horiz = cells.translate(WALL_FLAG[2]) if open_edges else b'\x01'*width
+			vert  = bytes(width+1)
+
+		# Build every junction pattern of the row at once from the walls
+		# to the right (1), below (2), to the left (4), and above (8)
+		# of each junction, then look up the junction text
+		horiz = int.from_bytes(horiz, 'little')
+		pattern = horiz | int.from_bytes(vert, 'little') << 1 \
+			| horiz << 10 | int.from_bytes(above, 'little') << 3
+		pattern = pattern.to_bytes(width+1, 'little').decode('latin-1')
+		print_rows.append(pattern.translate(JUNCTION_TEXT)[:-1])
+
+		if row < height:
+			print_rows.append(vert.decode('latin-1').translate(CELL_TEXT)[:-1])
+		above = vert
+
+	return print_rows
+
+
 class Maze:
 	""" A 2-D maze generator and renderer, including navigation system """
 
-	def __init__(self, width, height, exploration=0.):
-		""" Set the maze's width, height, list of cells,
-			and exploration parameter """
+	# Available generation algorithms, by name
+	generators = GENERATORS
+
+	def __init__(self, width, height, exploration=0., algorithm='dfs', rng=None):
+		""" Set the maze's width, height, list of cells, exploration
+			parameter, generation algorithm, and the random number
+			generator used to generate it (a new one if not given) """
+
+		if algorithm not in self.generators:
+			raise Exception('Generation algorithm \'{}\' is unknown.'.format(algorithm))
 
 		self.width      = width
 		self.height     = height
-		self.cell_ids   = list(range(width*height))
+		self.cell_ids   = range(width*height)
 		self.exploration = exploration
+		self.algorithm  = algorithm
+		self.rng        = rng if rng is not None else random.Random()
 
-		# Make each cell with the proper connections using the Cell class
+		# Offsets to the neighboring cell in each direction
+		self.steps      = (-width, 1, width, -1)
+
+		# Make the wall mask with the proper connections for each cell, and
+		# count the changes made to it, for caches of anything that depends
+		# on the walls
+		self.wall_version = 0
 		self.make_cells()
 		self.current_cell = 0
 
+		# Cells whose contents or walls have changed since the last redraw
+		self.dirty       = set()
+		self.dirty_walls = set()
+
+		# Cached shortest path distances through the maze
+		self.paths      = Pathfinder(self)
+
+
+	@property
+	def cell_list(self):
+		""" Cell views onto the wall mask, made on demand for compatibility """
+		return CellViewList(self)
+
+
+	def cell_objects(self):
+		""" Return a Cell built from the wall mask for every cell, for code
+			which must keep Cell objects rather than views """
+
+		width = self.width
+		adjacency = self.adjacency
+		walls = self.walls
+		make = Cell.from_mask
+
+		# Every cell refers to its neighbors by the same ID objects as the
+		# neighbors' own, rather than each holding new copies of them
+		ids = list(self.cell_ids)
+
+		# The cells hold only IDs, so can never be part of a reference
+		# cycle, and the collector passes that allocating them would set
+		# off are only wasted time
+		enabled = gc.isenabled()
+		gc.disable()
+		try:
+			cells = []
+			for i in ids:
+				a = adjacency[i]
+				cells.append(make(i,
+					ids[i - width] if a & 1 else NONE,
+					ids[i + 1] if a & 2 else NONE,
+					ids[i + width] if a & 4 else NONE,
+					ids[i - 1] if a & 8 else NONE,
+					walls[i]))
+		finally:
+			if enabled:
+				gc.enable()
+		return cells
+
 
 	def __str__(self):
 		print_rows, _ = self.render(layer_override=0)
 		return '\n'.join(print_rows)
 
 
+	@classmethod
+	def from_render(cls, print_rows):
+		""" Rebuild a maze from the rows of text drawn by render, reading
+			the walls and the contents of each cell back from the text """
+
+		height = (len(print_rows)-1)//2
+		width  = (len(print_rows[0])-1)//2
+		maze = cls(width, height, 0.)
+
+		# A wall is open wherever the text between two cells is blank
+		# (the outer boundary is always closed, as in the adjacency mask)
+		for row in range(height):
+			top, middle, bottom = print_rows[2*row:2*row+3]
+			for col in range(width):
+				x = 2*col + 1
+				mask = (OPEN[0] if top[x] == ' ' else 0) \
+					| (OPEN[1] if middle[x+1] == ' ' else 0) \
+					| (OPEN[2] if bottom[x] == ' ' else 0) \
+					| (OPEN[3] if middle[x-1] == ' ' else 0)
+				i = row*width + col
+				maze.walls[i] = mask & maze.adjacency[i]
+				maze.cell_state_read(i, middle[x])
+
+		return maze
+
+
 	def render(self, layer_override=1):
 		""" Return the maze as a rendered drawing,
 			including player position """
 
-		# Set up of rows of characters
-		print_rows = ['' for _ in range(self.height*2+1)]
-		layers = []
+		print_rows = render_walls(self.walls, self.width, self.height)
+
+		# Get the appropriate character for the contents of each occupied
+		# cell, in order of cell ID
+		layers = self.render_states(print_rows, sorted(set(self.occupied_cells())), layer_override)
 
-		# Iterate over all cells in maze
-		for i in self.cell_ids:
-
-			# Identify row and column of this cell
-			row = i//self.width
-			col = i%self.width
-
-			# Determine whether cells immediately above or to the left
-			# are accessible (value of 0 if accessible, -1 if not)
-			a = self.cell_list[i].can_access(i-self.width)
-			b = self.cell_list[i].can_access(i-1)
-
-			# Select the wall characters around this cell based on
-			# accessibility of other cells (a and b)
-			wall_a = ' ' if a == 0 else '─'
-			wall_b = ' ' if b == 0 else '│'
-
-			# Depending on the current row and column, select the appropriate
-			# junction character for clean rendering
-			if row != 0 and col != 0:
-				# If not in the 0th row or column, use all four cells about
-				# the junction to the upper left of the current cell to
-				# determine the appropriate junction character
-				c = self.cell_list[i-(self.width+1)].can_access(i-1)
-				d = self.cell_list[i-(self.width+1)].can_access(i-self.width)
-
-				# Pattern ranges from 0 to 15
-				pattern = -1*a + -2*b + -4*c + -8*d
-				jun = char_dict[pattern]
-
-			elif row != 0 and col == 0:
-				# Get junction pattern for the 0th column
-				pattern = -1*a + 2 + 8
-				jun = char_dict[pattern]
-
-			elif row == 0 and col != 0:
-				# Get junction pattern for the 0th row
-				pattern = 1 + 4 + -2*b
-				jun = char_dict[pattern]
-
-			elif row == 0 and col == 0:
-				# Get junction pattern for the 0th row, 0th column
-				jun = '┌'
-
-			# Get the appropriate character for the contents of the cell
+		# Join the list of rows into a block of rendered text and return
+		return print_rows, layers
+
+
+	def render_view(self, x0, y0, width, height, layer_override=1):
+		""" Return the rectangle of the maze with its upper left cell at
+			(x0, y0) as a rendered drawing, in the form returned by render.
+			Only the cells in view are visited, so the cost follows the size
+			of the view rather than of the maze. """
+
+		if x0 < 0 or y0 < 0 or x0+width > self.width or y0+height > self.height:
+			raise Exception('View \'{}\' is outside the maze.'.format((x0, y0, width, height)))
+
+		walls = b''.join(self.walls[(y0+r)*self.width+x0:(y0+r)*self.width+x0+width] for r in range(height))
+		print_rows = render_walls(walls, width, height, open_edges=True)
+
+		cells = [(y0+r)*self.width + x0+c for r in range(height) for c in range(width)]
+		layers = self.render_states(print_rows, cells, layer_override, x0, y0)
+		return print_rows, layers
+
+
+	def render_states(self, print_rows, cells, layer_override=1, x0=0, y0=0):
+		""" Draw the states of the given cells on layer 0 into the rows of
+			characters (whose upper left cell is at (x0, y0)), and return
+			the layers holding the rest """
+
+		layers = []
+		overlay = {}
+		for i in cells:
 			state, layer = self.cell_state_render(i)
 
 			# Override layer if desired
 			layer *= layer_override
 
-			# Record state and current position if layer is not 0
+			# Record state and current position if layer is not 0.
+			# Otherwise the state is drawn into the rows of characters.
+			xpos = 2*(i%self.width - x0) + 1
+			ypos = 2*(i//self.width - y0) + 1
 			if layer != 0:
 				while len(layers) < layer: layers.append([])
-				xpos = 2*col + 1
-				ypos = 2*row + 1
-				cdata = (xpos, ypos, state)
-				layers[layer-1].append(cdata)
-
-			# Collect the junction, walls, and cell contents and append them
-			# to the rows of characters.  Only layer 0 is used here.
-			cstate = state if layer == 0 else ' '
-			print_rows[2*row]   += (jun + wall_a)
-			print_rows[2*row+1] += (wall_b + cstate)
-
-		# Complete the bottom row of characters
-		for i in range(self.width):
-
-			# Make ID and column
-			id = i + self.width*(self.height-1)
-			col = id%self.width
-
-			# If in the 0th column, make 'bottom left' character
-			# Otherwise, check the accessibility of the cell to the left
-			# and choose the junction character accordingly
-			if i == 0:
-				jun = '└'
-			else:
-				b = self.cell_list[id].can_access(id-1)
-				pattern = 1 + 4 + -8*b
-				jun = char_dict[pattern]
-
-			# Append the boundary and boundary junction for each cell
-			print_rows[-1] += jun + '─'
-
-		# Complete the rightmost column of characters
-		for i in range(self.height):
-
-			# Make ID, row, and column
-			id = self.width*(i+1) - 1
-			col = id%self.width
-			row = id//self.width
-
-			# If in the last column, make 'upper right' character
-			# Otherwise, check the accessibility of the cell direcly above
-			# and choose the junction character accordingly
-			if i == 0:
-				jun = '┐'
-			else:
-				a = self.cell_list[id].can_access(id-self.width)
-				pattern = 2 + -4*a + 8
-				jun = char_dict[pattern]
-
-			# Append the boundary and boundary junction for each cell
-			print_rows[2*row] += jun
-			print_rows[2*row+1] += '│'
-
-		# Put the 'lower right' character at the end of the last character row
-		print_rows[-1] += '┘'
-
-		# Join the list of rows into a block of rendered text and return
-		return print_rows, layers
+				layers[layer-1].append((xpos, ypos, state))
+			elif state != ' ':
+				overlay.setdefault(ypos, []).append((xpos, state))
+
+		for ypos, states in overlay.items():
+			chars = list(print_rows[ypos])
+			for xpos, state in states:
+				chars[xpos] = state
+			print_rows[ypos] = ''.join(chars)
+
+		return layers
+
+
+	def focus(self):
+		""" Return the (x, y) position of the player, for the camera of a
+			view to follow """
+		return self.current_cell % self.width, self.current_cell // self.width
+
+
+	def occupied_cells(self):
+		""" Return the IDs of cells whose contents may not be empty """
+		return [self.current_cell]
+
+
+	def wall_glyph(self, y, x):
+		""" Return the wall character at row y, column x of the rendered
+			maze (cell contents are not included) """
+
+		# Horizontal wall on top of cell (r, c), and vertical wall to the
+		# left of cell (r, c), including the outer boundary walls
+		def hwall(r, c):
+			if not (0 <= c < self.width and 0 <= r <= self.height):
+				return 0
+			elif r == 0 or r == self.height:
+				return 1
+			return 0 if self.walls[r*self.width+c] & OPEN[0] else 1
+
+		def vwall(r, c):
+			if not (0 <= r < self.height and 0 <= c <= self.width):
+				return 0
+			elif c == 0 or c == self.width:
+				return 1
+			return 0 if self.walls[r*self.width+c] & OPEN[3] else 1
+
+		row, col = y//2, x//2
+		if y%2 == 0 and x%2 == 0:
+			# Junction pattern: wall to the right (1), below (2), to the
+			# left (4), and above (8) the junction
+			pattern = hwall(row, col) + 2*vwall(row, col) \
+				+ 4*hwall(row, col-1) + 8*vwall(row-1, col)
+			return char_dict[pattern]
+		elif y%2 == 0:
+			return '─' if hwall(row, col) else ' '
+		elif x%2 == 0:
+			return '│' if vwall(row, col) else ' '
+		return ' '
 
 
 	def cell_state_render(self, i):
@@ -176,133 +303,201 @@ class Maze:
 		return state, layer
 
 
+	def cell_state_read(self, i, state):
+		""" Set the contents of a cell from its rendered symbol """
+		if state == 'x':
+			self.current_cell = i
+
+
 	def make_cells(self):
-		""" Generate the list of cells used in the maze """
+		""" Generate the wall mask used in the maze, one byte per cell """
+
+		# Build the mask for a single row, where every passage to an
+		# adjacent cell starts out open (as with the old Cell lists,
+		# where the accessible cells began equal to the adjacent cells)
+		def row_mask(up, down):
+			row = bytearray()
+			for col in range(self.width):
+				mask = (OPEN[0] if up else 0) | (OPEN[2] if down else 0)
+				mask |= OPEN[3] if col != 0 else 0
+				mask |= OPEN[1] if col != self.width-1 else 0
+				row.append(mask)
+			return row
+
+		# Stack the rows, treating the top and bottom rows specially
+		if self.height == 1:
+			self.walls = row_mask(False, False)
+		else:
+			self.walls = row_mask(False, True) \
+				+ row_mask(True, True)*(self.height-2) \
+				+ row_mask(True, False)
 
-		# Make the list
-		self.cell_list = []
+		# Keep a copy of the fully open mask, which records the directions
+		# in which each cell has an adjacent cell
+		self.adjacency = bytes(self.walls)
+		self.wall_version += 1
 
-		# Iterate over all cell ids
-		for i in self.cell_ids:
+		return 0
 
-			# Get the row and column of this cell
-			row = i//self.width
-			col = i%self.width
 
-			# Collect adjacent cells
-			adj = []
+	def direction(self, id_a, id_b):
+		""" Return the direction of travel from one cell to an adjacent
+			cell, or -1 if the cells are not adjacent """
 
-			# Based on the column, include the requisite adjacent cells
-			if col == 0:
-				adj.append(i+1)
-			elif col == self.width-1:
-				adj.append(i-1)
-			else:
-				adj.extend([i-1, i+1])
+		if not (0 <= id_a < len(self.walls) and 0 <= id_b < len(self.walls)):
+			return -1
 
-			# Based on the row, include the requisite adjacent cells
-			if row == 0:
-				adj.append(i+self.width)
-			elif row == self.height-1:
-				adj.append(i-self.width)
-			else:
-				adj.extend([i-self.width, i+self.width])
+		diff = id_b - id_a
+		if diff == -self.width:
+			return 0
+		elif diff == self.width:
+			return 2
+		elif diff == 1 and id_b % self.width != 0:
+			return 1
+		elif diff == -1 and id_a % self.width != 0:
+			return 3
+		return -1
 
-			# When initializing the cells, make the accessible cells equal
-			# to the adjacent cells
-			acc = copy.copy(adj)
 
-			# Append a Cell object to the cell list
-			self.cell_list.append(Cell(i, adj, acc))
+	def adjacent(self, i):
+		""" Return the list of ids of cells adjacent to the given cell """
+		return [i + self.steps[d] for d in OPEN_DIRS[self.adjacency[i]]]
+
+
+	def accessible(self, i):
+		""" Return the list of ids of cells the given cell can access """
+		return [i + self.steps[d] for d in OPEN_DIRS[self.walls[i]]]
 
-		return 0
+
+	def can_access(self, id_a, id_b):
+		""" Identify whether one cell can access another """
+		d = self.direction(id_a, id_b)
+		return 0 if d != -1 and self.walls[id_a] & OPEN[d] else -1
+
+
+	def block_access(self, id_a, id_b):
+		""" Remove access from one cell to another """
+		d = self.direction(id_a, id_b)
+		if d != -1 and self.walls[id_a] & OPEN[d]:
+			self.walls[id_a] &= ~OPEN[d]
+			self.dirty_walls.add(id_a)
+			self.wall_version += 1
+			self.paths.clear()
+			return 0
+		else:
+			return -1
+
+
+	def make_access(self, id_a, id_b):
+		""" Give one cell access to another, if viable """
+		d = self.direction(id_a, id_b)
+		if d == -1:
+			return -2
+		elif not self.walls[id_a] & OPEN[d]:
+			self.walls[id_a] |= OPEN[d]
+			self.dirty_walls.add(id_a)
+			self.wall_version += 1
+			self.paths.opened(id_a, id_b)
+			return 0
+		else:
+			return -1
 
 
 	def initialize_walls(self):
 		""" Make all connections between cells walls """
 
-		for id_a in self.cell_ids:
-			for id_b in self.cell_ids[id_a:]:
-				self.make_wall_pair(id_a, id_b)
+		self.walls[:] = bytes(len(self.walls))
+		self.wall_version += 1
 
 
 	def make_wall_pair(self, id_a, id_b):
 		""" Between two cells, make a wall """
 
-		a = self.cell_list[id_a].block_access(id_b)
-		b = self.cell_list[id_b].block_access(id_a)
+		a = self.block_access(id_a, id_b)
+		b = self.block_access(id_b, id_a)
 		return a + b
 
 
 	def remove_wall_pair(self, id_a, id_b):
 		""" Between two cells, remove a wall """
 
-		a = self.cell_list[id_a].make_access(id_b)
-		b = self.cell_list[id_b].make_access(id_a)
+		a = self.make_access(id_a, id_b)
+		b = self.make_access(id_b, id_a)
 		return a + b
 
 
 	def make_maze(self):
-		""" Using a depth-first search with a curiosity parameter, generate
-			a new maze design """
+		""" Using the maze's generation algorithm, generate a new maze
+			design """
 
-		# Set all connections to walls
+		# Set all connections to walls, then carve out the passages
 		self.initialize_walls()
+		self.generators[self.algorithm](self)
+		self.paths.clear()
+		self.wall_version += 1
+
+		# Set the starting cell to the upper left, and return
+		self.current_cell = 0
+		return 0
+
+
+	@register_generator('dfs')
+	def depth_first_search(self):
+		""" Using a depth-first search with a curiosity parameter, carve
+			the passages of a maze whose walls are all in place """
+
+		walls = self.walls
+		adjacency = self.adjacency
+		steps = self.steps
+		rng = self.rng
 
-		# Generate a starting list of unvisited cells
-		unvisited_cells = copy.copy(self.cell_ids)
+		# Mark the starting cell as visited, and keep the rest in a pool
+		# of unvisited cells from which restarts can be drawn
+		visited = bytearray(len(self.cell_ids))
+		unvisited_cells = CellPool(len(self.cell_ids), rng=rng)
+		visited[self.current_cell] = 1
 		unvisited_cells.remove(self.current_cell)
 
 		# Set up a stack and start the depth search loop
-		stack = [self.current_cell]
-		while unvisited_cells != []:
+		current = self.current_cell
+		stack = [current]
+		while unvisited_cells:
 
-			# Determine which adjacent cells are visited or unvisted
-			unv_adj = [c for c in self.cell_list[self.current_cell].adj if c in unvisited_cells]
-			vis_adj = [c for c in self.cell_list[self.current_cell].adj if not c in unvisited_cells and (len(stack)>0 and c != stack[-1])]
+			# Determine in which directions the adjacent cells are visited
+			# or unvisited
+			dirs = OPEN_DIRS[adjacency[current]]
+			unv_adj = [d for d in dirs if not visited[current+steps[d]]]
 
 			# If there are unvisited adjacent cells, proceed.  Otherwise,
 			# retrace back through the stack
 			if unv_adj:
 
 				# If the curiosity parameter is satisfied, use depth-first
-				# search.  Otherwise, if there are adjacent previously visited
-				# cells, make a tertiary selection.  If neither of those things
-				# occurs, pass to the next iteration
-				if random.random() > self.exploration:
-
-					# Randomly select the next cell from the list of unvisited
-					# cells and remove the walls blocking the movement
-					next = random.choice(unv_adj)
-					self.remove_wall_pair(self.current_cell, next)
-
-					# Record the next cell in the stack, remove the cell ID
-					# from the list of unvisited cells, and complete the
-					# movement by setting the new current cell
-					stack.append(next)
-					if next in unvisited_cells:
-						unvisited_cells.remove(next)
-					self.current_cell = next
-
-				elif not vis_adj == []:
-
-					# Randomly select the next cell from the list of visited
-					# cells and remove the walls blocking the movement
-					next = random.choice(vis_adj)
-					self.remove_wall_pair(self.current_cell, next)
-
-					# Record the next cell in the stack, remove the cell ID
-					# from the list of unvisited cells, and complete the
-					# movement by setting the new current cell
-					stack.append(next)
-					if next in unvisited_cells:
-						unvisited_cells.remove(next)
-					self.current_cell = next
-
+				# search and randomly select the next cell from the list of
+				# unvisited cells.  Otherwise, if there are adjacent
+				# previously visited cells, make a tertiary selection.  If
+				# neither of those things occurs, pass to the next iteration
+				if rng.random() > self.exploration:
+					d = rng.choice(unv_adj)
 				else:
-
-					# Do nothing if neither of the other conditions is satisfied
-					pass
+					vis_adj = [d for d in dirs if visited[current+steps[d]] and (len(stack)>0 and current+steps[d] != stack[-1])]
+					if vis_adj == []:
+						continue
+					d = rng.choice(vis_adj)
+
+				# Remove the walls blocking the movement
+				next = current + steps[d]
+				walls[current] |= OPEN[d]
+				walls[next] |= OPEN[OPPOSITE[d]]
+
+				# Record the next cell in the stack, mark the cell as
+				# visited, and complete the movement by setting the new
+				# current cell
+				stack.append(next)
+				if not visited[next]:
+					visited[next] = 1
+					unvisited_cells.remove(next)
+				current = next
 
 			else:
 
@@ -312,13 +507,11 @@ class Maze:
 				#    if the curiosity parameter has gotten the depth-first
 				#    search algorithm stuck in some corner of visited cells.
 				if stack != []:
-					self.current_cell = stack.pop(-1)
+					current = stack.pop(-1)
 				else:
-					ves = random.choice(unvisited_cells)
-					self.current_cell = random.choice([c for c in self.cell_list[ves].adj])
+					ves = unvisited_cells.choice(rng)
+					current = rng.choice(self.adjacent(ves))
 
-		# Set the starting cell to the upper left, and return
-		self.current_cell = 0
 		return 0
 
 
@@ -339,8 +532,22 @@ class Maze:
 
 		# Test if the target cell is accessible, and set the current cell
 		# to the target if so.
-		if self.cell_list[self.current_cell].can_access(target) == 0:
+		if self.can_access(self.current_cell, target) == 0:
+			self.dirty.update((self.current_cell, target))
 			self.current_cell = target
 			return 0
 		else:
 			return -1
+
+
+	def hint(self):
+		""" Return the direction of the next move along a shortest path
+			from the current cell to the goal, or -1 if there is none """
+
+		step = self.paths.next_step(self.current_cell, self.cell_ids[-1])
+		return -1 if step == -1 else self.direction(self.current_cell, step)
+
+
+	def is_solvable(self, start=0):
+		""" Identify whether the goal can be reached from a starting cell """
+		return self.paths.distance(start, self.cell_ids[-1]) != -1
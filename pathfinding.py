@@ -0,0 +1,158 @@
+### Distance fields and shortest paths for 2-D maze module
+### Date:     10/17/2026
+
+from array import array
+from collections import deque, OrderedDict
+from cell import OPEN_DIRS
+
+
+class DistanceField:
+    """ Breadth-first search distances from a source cell to every cell of
+        a maze, through its open passages (-1 where unreachable) """
+
+    def __init__(self, maze, source):
+        """ Set the maze and source cell, and run the search """
+        self.maze   = maze
+        self.source = source
+
+        # Offsets to the accessible neighbors for each wall mask
+        self.offsets = [tuple(maze.steps[d] for d in dirs) for dirs in OPEN_DIRS]
+        self.search()
+
+
+    def __repr__(self):
+        return 'DistanceField(source={})'.format(self.source)
+
+
+    def __getitem__(self, cell):
+        """ Return the number of moves between a cell and the source """
+        return self.dist[cell]
+
+
+    def search(self):
+        """ Find the distance of every cell from the source, a whole
+            frontier at a time """
+
+        walls = self.maze.walls
+        offsets = self.offsets
+
+        self.dist = dist = array('i', [-1])*len(walls)
+        dist[self.source] = 0
+
+        frontier = [self.source]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for u in frontier:
+                for o in offsets[walls[u]]:
+                    if dist[u+o] < 0:
+                        dist[u+o] = d
+                        next_frontier.append(u+o)
+            frontier = next_frontier
+
+
+    def opened(self, id_a, id_b):
+        """ Update the distances for a newly opened passage from one cell
+            to another.  Distances can only shrink, so only the cells
+            which are now closer are searched again. """
+
+        walls = self.maze.walls
+        offsets = self.offsets
+        dist = self.dist
+
+        if dist[id_a] < 0 or 0 <= dist[id_b] <= dist[id_a]+1:
+            return 0
+
+        dist[id_b] = dist[id_a]+1
+        frontier = deque([id_b])
+        updated = 1
+        while frontier:
+            u = frontier.popleft()
+            for o in offsets[walls[u]]:
+                if dist[u+o] < 0 or dist[u+o] > dist[u]+1:
+                    dist[u+o] = dist[u]+1
+                    frontier.append(u+o)
+                    updated += 1
+        return updated
+
+
+    def next_step(self, cell):
+        """ Return the accessible neighbor one move closer to the source,
+            or -1 if the cell is the source or cannot reach it """
+
+        d = self.dist[cell]
+        if d <= 0:
+            return -1
+        for o in self.offsets[self.maze.walls[cell]]:
+            if self.dist[cell+o] == d-1:
+                return cell+o
+        return -1
+
+
+    def path(self, cell):
+        """ Return the list of cells along a shortest path from a cell to
+            the source, or an empty list if there is none """
+
+        if self.dist[cell] < 0:
+            return []
+
+        path = [cell]
+        while cell != self.source:
+            cell = self.next_step(cell)
+            path.append(cell)
+        return path
+
+
+class Pathfinder:
+    """ Cache of distance fields on a maze, keyed by source cell.  Fields
+        are updated in place when walls are removed, and dropped when walls
+        are added. """
+
+    def __init__(self, maze, max_fields=8):
+        """ Set the maze and the number of fields to keep """
+        self.maze       = maze
+        self.max_fields = max_fields
+        self.fields     = OrderedDict()
+
+
+    def field(self, source):
+        """ Return the distance field from a source cell, searching the
+            maze only if it is not cached """
+
+        if source in self.fields:
+            self.fields.move_to_end(source)
+        else:
+            self.fields[source] = DistanceField(self.maze, source)
+            if len(self.fields) > self.max_fields:
+                self.fields.popitem(last=False)
+        return self.fields[source]
+
+
+    def distance(self, id_a, id_b):
+        """ Return the number of moves between two cells, or -1 if there is
+            no path between them """
+        return self.field(id_b)[id_a]
+
+
+    def next_step(self, id_a, id_b):
+        """ Return the cell one move along a shortest path from one cell
+            to another, or -1 if there is none """
+        return self.field(id_b).next_step(id_a)
+
+
+    def path(self, id_a, id_b):
+        """ Return the list of cells along a shortest path between two
+            cells, or an empty list if there is none """
+        return self.field(id_b).path(id_a)
+
+
+    def opened(self, id_a, id_b):
+        """ Update every cached field for a newly opened passage """
+        for f in self.fields.values():
+            f.opened(id_a, id_b)
+
+
+    def clear(self):
+        """ Drop every cached field, as when walls are added """
+        self.fields.clear()
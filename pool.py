@@ -0,0 +1,98 @@
+### Cell pool class for 2-D maze module
+### Date:     10/17/2026
+
+import random
+from array import array
+
+
+class CellPool:
+    """ A set of cell IDs drawn from range(size), supporting constant time
+        insertion, removal, membership tests, and random selection """
+
+    def __init__(self, size, full=True, rng=None):
+        """ Set up the pool over IDs 0 to size-1, starting either with all
+            of the IDs (full) or none of them.  Random selections draw from
+            the given generator, or one seeded from the system. """
+
+        self.rng = rng if rng is not None else random.Random()
+
+        # Pool members, packed at the front of the ids array, and the
+        # position of each ID within that array (-1 if not in the pool)
+        if full:
+            self.ids = array('i', range(size))
+            self.pos = array('i', range(size))
+        else:
+            self.ids = array('i')
+            self.pos = array('i', [-1])*size
+
+
+    def __repr__(self):
+        """ Return the number of cells in the pool """
+        return 'CellPool(size={}, len={})'.format(len(self.pos), len(self.ids))
+
+
+    def __len__(self):
+        return len(self.ids)
+
+
+    def __contains__(self, id):
+        return 0 <= id < len(self.pos) and self.pos[id] != -1
+
+
+    def __iter__(self):
+        return iter(self.ids)
+
+
+    def add(self, id):
+        """ Add an ID to the pool, if not already present """
+        if self.pos[id] == -1:
+            self.pos[id] = len(self.ids)
+            self.ids.append(id)
+            return 0
+        else:
+            return -1
+
+
+    def remove(self, id):
+        """ Remove an ID from the pool by swapping the last member into
+            its place """
+        p = self.pos[id]
+        if p == -1:
+            return -1
+
+        last = self.ids.pop()
+        if last != id:
+            self.ids[p] = last
+            self.pos[last] = p
+        self.pos[id] = -1
+        return 0
+
+
+    def replace(self, id, new):
+        """ Put an ID not in the pool in the place of one that is, as
+            when an entity moves from one cell to another """
+        p = self.pos[id]
+        self.ids[p] = new
+        self.pos[new] = p
+        self.pos[id] = -1
+
+
+    def choice(self, rng=None):
+        """ Return a random ID from the pool, without removing it, drawn
+            from the pool's own generator unless another is given """
+        rng = rng if rng is not None else self.rng
+        return self.ids[rng.randrange(len(self.ids))]
+
+
+    def take(self, rng=None):
+        """ Remove and return a random ID from the pool """
+        id = self.choice(rng)
+        self.remove(id)
+        return id
+
+
+    def sample(self, k, rng=None):
+        """ Remove and return k distinct random IDs from the pool """
+        if k > len(self.ids):
+            raise Exception('Cannot take {} cells from a pool of {}.'.format(k, len(self.ids)))
+        return [self.take(rng) for _ in range(k)]
@@ -0,0 +1,169 @@
+### Frame time instrumentation for the curses loop
+### Date:     10/17/2026
+###
+### Enabled with `python main.py --profile [PREFIX]`, or by setting the
+### TERMINAL_DUNGEON_PROFILE environment variable to a prefix.  Each frame
+### is split into phases by marks placed through the loop, with the time
+### since the last mark counted towards the phase named.  On quit, the
+### histogram of each phase is written to PREFIX.txt.
+###
+### A cProfile trace of the whole game can be written to PREFIX.prof as
+### well, with `--trace` or by setting TERMINAL_DUNGEON_TRACE.  Tracing
+### slows every frame about twofold, so it is off unless asked for, and the
+### frame times recorded while it is on are those of the traced game.
+
+import os
+import bisect
+import cProfile
+from time import perf_counter_ns
+from collections import deque
+
+ENV_VAR = 'TERMINAL_DUNGEON_PROFILE'
+TRACE_VAR = 'TERMINAL_DUNGEON_TRACE'
+
+# Upper edges of the histogram bins, in milliseconds
+BINS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+# Phases which are not part of the frame time, as they wait on the player
+WAITING = ('input',)
+
+
+class FrameProfiler:
+	""" Per-phase frame timing, kept as a window of recent frame times for
+		percentiles and a fixed histogram of every frame for each phase.
+		When disabled, every method returns at once. """
+
+	def __init__(self, prefix=None, window=500, trace=False):
+		""" Enable timing if a prefix for the output files is given, set
+			the number of recent frames to take percentiles over, and trace
+			the game with cProfile as well if trace is set """
+
+		self.enabled = prefix is not None
+		self.prefix  = prefix
+
+		self.last    = perf_counter_ns()
+		self.current = {}					# Nanoseconds by phase, this frame
+		self.recent  = deque(maxlen=window)	# Recent frame times, in ns
+		self.totals  = {}					# Nanoseconds by phase, every frame
+		self.hists   = {}					# Histogram counts by phase
+		self.frames  = 0
+
+		self.trace = cProfile.Profile() if self.enabled and trace else None
+		if self.trace is not None:
+			self.trace.enable()
+
+
+	@classmethod
+	def from_env(cls, prefix=None, trace=False):
+		""" Make a profiler enabled by the given prefix, or else by the
+			environment variable, and tracing if trace or its environment
+			variable is set """
+		return cls(prefix if prefix is not None else os.environ.get(ENV_VAR) or None,
+			trace=trace or bool(os.environ.get(TRACE_VAR)))
+
+
+	def mark(self, phase):
+		""" Count the time since the last mark towards a phase """
+
+		if not self.enabled:
+			return
+		now = perf_counter_ns()
+		self.current[phase] = self.current.get(phase, 0) + now - self.last
+		self.last = now
+
+
+	def wrap(self, obj, name, phase, before):
+		""" Time calls to a method of an object as their own phase, with the
+			time before each call counted towards another phase """
+
+		if not self.enabled:
+			return
+		fn = getattr(obj, name)
+
+		def timed(*args, **kwargs):
+			self.mark(before)
+			result = fn(*args, **kwargs)
+			self.mark(phase)
+			return result
+		setattr(obj, name, timed)
+
+
+	def end_frame(self):
+		""" Close the frame, recording its phases, and start the next """
+
+		if not self.enabled:
+			return
+
+		frame = 0
+		for phase, ns in self.current.items():
+			self.totals[phase] = self.totals.get(phase, 0) + ns
+			hist = self.hists.setdefault(phase, [0]*(len(BINS)+1))
+			hist[bisect.bisect_left(BINS, ns/1e6)] += 1
+			if phase not in WAITING:
+				frame += ns
+
+		self.recent.append(frame)
+		self.frames += 1
+		self.current = {}
+
+
+	def percentile(self, p):
+		""" Return the p-th percentile of recent frame times, in ms """
+
+		if not self.recent:
+			return 0.
+		times = sorted(self.recent)
+		return times[min(len(times)-1, int(p/100*len(times)))]/1e6
+
+
+	def mean(self, phase):
+		""" Return the mean time of a phase per frame, in ms """
+		return self.totals.get(phase, 0)/max(self.frames, 1)/1e6
+
+
+	def hud(self):
+		""" Return the lines of the live display of frame times """
+
+		if not self.enabled:
+			return []
+		return [
+			'Frame p50: {:>7.2f} ms'.format(self.percentile(50)),
+			'Frame p99: {:>7.2f} ms'.format(self.percentile(99)),
+			'Render:    {:>7.2f} ms'.format(self.mean('render')),
+			'Enemies:   {:>7.2f} ms'.format(self.mean('enemies')),
+		]
+
+
+	def report(self):
+		""" Return the per-phase histograms as text """
+
+		lines = ['{} frames, p50 {:.3f} ms, p99 {:.3f} ms (of the last {})'.format(
+			self.frames, self.percentile(50), self.percentile(99), len(self.recent))]
+
+		edges = ['<{}'.format(b) for b in BINS] + ['>={}'.format(BINS[-1])]
+		for phase, hist in self.hists.items():
+			lines.append('')
+			lines.append('{} (mean {:.3f} ms{})'.format(phase, self.mean(phase),
+				', not counted in frame time' if phase in WAITING else ''))
+			top = max(hist)
+			for edge, count in zip(edges, hist):
+				if count:
+					lines.append('  {:>8} ms {:>7}  {}'.format(edge, count, '#'*max(1, 40*count//top)))
+		return '\n'.join(lines)
+
+
+	def dump(self):
+		""" Write the histograms and the cProfile trace, if any, and
+			return the paths written """
+
+		if not self.enabled:
+			return []
+
+		with open(self.prefix + '.txt', 'w') as f:
+			f.write(self.report() + '\n')
+		if self.trace is None:
+			return [self.prefix + '.txt']
+
+		self.trace.disable()
+		self.trace.dump_stats(self.prefix + '.prof')
+		return [self.prefix + '.txt', self.prefix + '.prof']
@@ -0,0 +1,219 @@
+### Incremental curses renderer for the dungeon
+### Date:     10/17/2026
+
+import curses
+
+
+class RenderCache:
+	""" Draws a dungeon onto a curses window in full once, then redraws
+		only the cells the dungeon has marked as dirty since """
+
+	def __init__(self, stdscr, d, corner_x, corner_y):
+		""" Set the window, dungeon, and screen position of the upper left
+			corner of the maze """
+
+		self.stdscr   = stdscr
+		self.d        = d
+		self.corner_x = corner_x
+		self.corner_y = corner_y
+
+		# Draw everything on the first frame
+		self.full = True
+
+
+	def draw(self):
+		""" Draw the frame, returning the number of cells redrawn """
+
+		if self.full:
+			return self.draw_full()
+
+		d = self.d
+
+		# Redraw the walls around cells whose walls have changed
+		for i in d.dirty_walls:
+			row = 2*(i//d.width)
+			col = 2*(i%d.width)
+			for y in range(row, row+3):
+				for x in range(col, col+3):
+					if y != row+1 or x != col+1:
+						self.stdscr.addstr(self.corner_y+y, self.corner_x+x,
+							d.wall_glyph(y, x), curses.color_pair(1))
+
+		# Redraw the contents of cells whose contents have changed
+		for i in d.dirty:
+			self.draw_cell(i)
+
+		count = len(d.dirty | d.dirty_walls)
+		d.dirty.clear()
+		d.dirty_walls.clear()
+		return count
+
+
+	def draw_full(self):
+		""" Draw the whole maze and every layer of its contents """
+
+		d = self.d
+		layer0, layers = d.render()
+
+		for i, l in enumerate(layer0):
+			self.stdscr.addstr(self.corner_y+i, self.corner_x, l, curses.color_pair(1))
+
+		for i, l in enumerate(layers):
+			for xpos, ypos, char in l:
+				self.stdscr.addstr(self.corner_y+ypos, self.corner_x+xpos,
+					char, curses.color_pair(i+2))
+
+		self.full = False
+		d.dirty.clear()
+		d.dirty_walls.clear()
+		return len(d.cell_ids)
+
+
+	def draw_cell(self, i):
+		""" Draw the contents of one cell, colored by its layer """
+
+		state, layer = self.d.cell_state_render(i)
+		xpos = 2*(i%self.d.width) + 1
+		ypos = 2*(i//self.d.width) + 1
+		self.stdscr.addstr(self.corner_y+ypos, self.corner_x+xpos,
+			state, curses.color_pair(layer+1))
+
+
+class FogRenderer(RenderCache):
+	""" Draws a dungeon under fog of war: only the explored cells are
+		drawn, and only the contents of the cells in sight.  Each frame
+		redraws the cells which came into or went out of sight, and the
+		changed cells among those in sight; changes out of sight cost
+		nothing. """
+
+	def __init__(self, stdscr, d, corner_x, corner_y, fov):
+		""" Set the window, dungeon, screen position of the upper left
+			corner of the maze, and the field of view of the player """
+
+		RenderCache.__init__(self, stdscr, d, corner_x, corner_y)
+		self.fov = fov
+
+
+	def draw(self):
+		""" Draw the frame, returning the number of cells redrawn """
+
+		if self.full:
+			return self.draw_full()
+
+		d = self.d
+		entered, left = self.fov.update()
+		cells = entered | left | ((d.dirty | d.dirty_walls) & self.fov.visible)
+		for i in cells:
+			self.draw_block(i)
+
+		d.dirty.clear()
+		d.dirty_walls.clear()
+		return len(cells)
+
+
+	def draw_full(self):
+		""" Draw every explored cell, and the contents of those in sight """
+
+		d = self.d
+		self.fov.update()
+		layer0, layers = self.fov.mask(*d.render())
+
+		for i, l in enumerate(layer0):
+			self.stdscr.addstr(self.corner_y+i, self.corner_x, l, curses.color_pair(1))
+
+		for i, l in enumerate(layers):
+			for xpos, ypos, char in l:
+				self.stdscr.addstr(self.corner_y+ypos, self.corner_x+xpos,
+					char, curses.color_pair(i+2))
+
+		self.full = False
+		d.dirty.clear()
+		d.dirty_walls.clear()
+		return len(self.fov.explored)
+
+
+	def draw_block(self, i):
+		""" Draw the walls around a cell, where explored, and its contents,
+			if in sight """
+
+		d = self.d
+		row = 2*(i//d.width)
+		col = 2*(i%d.width)
+		for y in range(row, row+3):
+			for x in range(col, col+3):
+				if y != row+1 or x != col+1:
+					self.stdscr.addstr(self.corner_y+y, self.corner_x+x,
+						d.wall_glyph(y, x) if self.fov.shown(y, x) else ' ', curses.color_pair(1))
+
+		if i in self.fov.visible:
+			self.draw_cell(i)
+		else:
+			self.stdscr.addstr(self.corner_y+row+1, self.corner_x+col+1, ' ', curses.color_pair(1))
+
+
+class ViewportRenderer:
+	""" Draws the part of a dungeon around the player that fits in a
+		rectangle of the window, for dungeons larger than the window (or
+		without bounds).  The camera scrolls to keep the player away from
+		the edges of the view, and each frame costs only as much as the
+		view, however large the dungeon. """
+
+	def __init__(self, stdscr, source, corner_x, corner_y, width, height, bounds=None, fov=None):
+		""" Set the window, the dungeon or world (anything with render_view
+			and focus methods), the screen position of the upper left
+			corner of the view, its size in cells, the (width, height) of
+			the dungeon, if it is bounded, to keep the camera inside, and
+			the field of view of the player, if under fog of war """
+
+		self.stdscr   = stdscr
+		self.source   = source
+		self.corner_x = corner_x
+		self.corner_y = corner_y
+		self.width    = width
+		self.height   = height
+		self.bounds   = bounds
+		self.fov      = fov
+
+		# Cell at the upper left of the view, placed on the first frame
+		self.origin = None
+
+
+	def follow(self, x, y):
+		""" Move the camera, if needed, so that the cell (x, y) is at least
+			a quarter of the view from each edge """
+
+		if self.origin is None:
+			self.origin = (x - self.width//2, y - self.height//2)
+
+		ox, oy = self.origin
+		mx, my = self.width//4, self.height//4
+		ox = min(max(ox, x - self.width + 1 + mx), x - mx)
+		oy = min(max(oy, y - self.height + 1 + my), y - my)
+
+		if self.bounds is not None:
+			ox = min(max(ox, 0), self.bounds[0] - self.width)
+			oy = min(max(oy, 0), self.bounds[1] - self.height)
+
+		self.origin = (ox, oy)
+		return self.origin
+
+
+	def draw(self):
+		""" Draw the view around the player, returning the number of cells
+			drawn """
+
+		ox, oy = self.follow(*self.source.focus())
+		rows, layers = self.source.render_view(ox, oy, self.width, self.height)
+		if self.fov is not None:
+			self.fov.update()
+			rows, layers = self.fov.mask(rows, layers, ox, oy)
+
+		for i, l in enumerate(rows):
+			self.stdscr.addstr(self.corner_y+i, self.corner_x, l, curses.color_pair(1))
+
+		for i, l in enumerate(layers):
+			for xpos, ypos, char in l:
+				self.stdscr.addstr(self.corner_y+ypos, self.corner_x+xpos,
+					char, curses.color_pair(i+2))
+
+		return self.width*self.height
@@ -0,0 +1,165 @@
+### Replay logs of games, re-executed headlessly
+### Date:     10/17/2026
+###
+### Usage:  python replay.py ~/.terminal_dungeon/replays/<log>.jsonl
+###
+### A replay log holds one game per line, as JSON: the seed and parameters
+### of the game, the keys played as a string (with '.' for any key which
+### only let the turn pass), and the score and moves at the end.  Games
+### played in real time, where the enemies move on a clock rather than after
+### each key, are flagged as such, with '|' among the keys for each tick of
+### the clock.  Since the seed decides every random number in a game,
+### playing the keys again must reach the same score, which makes the logs
+### regression tests.
+
+import os
+import sys
+import json
+import time
+from session import GameSession, ACTIONS, CHASE
+
+# Where the game writes its replay logs
+REPLAY_DIR = os.path.join(os.path.expanduser('~'), '.terminal_dungeon', 'replays')
+
+# Key recorded for each move of the enemies in a game played in real time
+TICK = '|'
+
+
+class Replay:
+	""" The seed, parameters, and keys of one game """
+
+	def __init__(self, seed, height, width, chase=CHASE, params=None, keys='', realtime=False):
+		""" Set the game to replay, any keys played so far, and whether it
+			is played in real time """
+
+		self.seed   = seed
+		self.height = height
+		self.width  = width
+		self.chase  = chase
+		self.params = params if params is not None else {}
+		self.keys   = list(keys)
+		self.realtime = realtime
+
+
+	@classmethod
+	def of(cls, session, realtime=False):
+		""" Start a replay of a new game session """
+		return cls(session.seed, session.height, session.width, session.chase, session.params,
+			realtime=realtime)
+
+
+	def __len__(self):
+		return len(self.keys)
+
+
+	def record(self, key):
+		""" Record a key played as a turn of the game """
+		self.keys.append(key if key in ACTIONS else '.')
+
+
+	def record_tick(self):
+		""" Record a move of the enemies in a game played in real time """
+		self.keys.append(TICK)
+
+
+	def to_json(self, session=None):
+		""" Return the replay as a line of JSON, with the score and moves
+			at the end of the given game session """
+
+		record = {
+			'seed':   self.seed,
+			'height': self.height,
+			'width':  self.width,
+			'chase':  self.chase,
+			'params': self.params,
+			'keys':   ''.join(self.keys),
+		}
+		if self.realtime:
+			record['realtime'] = True
+		if session is not None:
+			record['score'] = session.score
+			record['moves'] = session.moves
+		return json.dumps(record)
+
+
+	@classmethod
+	def from_json(cls, line):
+		""" Read a replay from a line of JSON, returning it with the score
+			and moves recorded (None if they were not) """
+
+		record = json.loads(line)
+		replay = cls(record['seed'], record['height'], record['width'],
+			record['chase'], record['params'], record['keys'], record.get('realtime', False))
+		return replay, record.get('score'), record.get('moves')
+
+
+	def play(self):
+		""" Play the game again from its seed and keys, without a terminal,
+			and return the finished game session """
+
+		session = GameSession(self.height, self.width, self.seed, self.chase, **self.params)
+		for key in self.keys:
+			if not self.realtime:
+				session.step(key)
+			elif key == TICK:
+				session.advance()
+			else:
+				session.act(key)
+		return session
+
+
+class ReplayLog:
+	""" A replay log file, with a line appended for each finished game """
+
+	def __init__(self, path=None):
+		""" Open a new log at the given path, or a new file named by the
+			time in the replay directory """
+
+		if path is None:
+			os.makedirs(REPLAY_DIR, exist_ok=True)
+			path = os.path.join(REPLAY_DIR, time.strftime('%Y%m%d-%H%M%S') + '.jsonl')
+		self.path = path
+		self.file = open(path, 'a')
+
+
+	def write(self, replay, session):
+		""" Append a game to the log, if any keys were played in it """
+
+		if len(replay):
+			self.file.write(replay.to_json(session) + '\n')
+			self.file.flush()
+
+
+	def close(self):
+		self.file.close()
+
+
+def main(argv):
+
+	if len(argv) != 1:
+		print('Usage: python replay.py <log>')
+		return 2
+
+	failures = 0
+	turns = 0
+	start = time.perf_counter()
+
+	with open(argv[0]) as f:
+		for n, line in enumerate(f):
+			replay, score, moves = Replay.from_json(line)
+			session = replay.play()
+			turns += len(replay)
+
+			status = 'OK' if (session.score, session.moves) == (score, moves) else 'MISMATCH'
+			failures += status != 'OK'
+			print('{:>4}  seed {:<20} {:>6} keys  score {:>6} (logged {})  {}'.format(
+				n, replay.seed, len(replay), session.score, score, status))
+
+	seconds = time.perf_counter() - start
+	print('{} turns replayed in {:.3f}s ({:.0f} turns/s), {} mismatched'.format(
+		turns, seconds, turns/seconds if seconds else 0, failures))
+	return 1 if failures else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+### Binary save file format for dungeons
+### Date:     10/17/2026
+###
+### A save file is a fixed 64-byte header, followed by the wall masks of
+### the cells packed two to a byte (four bits each, low nibble first), then
+### the cells of the enemies and of the rewards as 32-bit integers in order
+### of entity ID.  Every field is little-endian.
+
+import sys
+import mmap
+import struct
+from array import array
+from entities import EntityIndex
+
+MAGIC = b'TDGN'
+VERSION = 1
+
+# Magic, version, flags, width, height, exploration, generation algorithm,
+# player cell, moves, attacks, score, number of enemies and of rewards
+HEADER = struct.Struct('<4sHHIId16siiiiII')
+
+# Header flags
+DONE = 1
+
+# Byte translation tables splitting a packed byte into the wall masks of
+# its two cells
+LOW_NIBBLE  = bytes(b & 15 for b in range(256))
+HIGH_NIBBLE = bytes(b >> 4 for b in range(256))
+
+
+def pack_walls(walls):
+    """ Pack a wall mask into half as many bytes, two cells to a byte """
+
+    walls = bytes(walls) + bytes(len(walls)%2)
+    low  = int.from_bytes(walls[0::2], 'little')
+    high = int.from_bytes(walls[1::2], 'little')
+    return (low | high << 4).to_bytes(len(walls)//2, 'little')
+
+
+def unpack_walls(packed, cells):
+    """ Unpack the wall mask of the given number of cells """
+
+    walls = bytearray(2*len(packed))
+    walls[0::2] = packed.translate(LOW_NIBBLE)
+    walls[1::2] = packed.translate(HIGH_NIBBLE)
+    del walls[cells:]
+    return walls
+
+
+def int_array(values):
+    """ Return the bytes of a list of little-endian 32-bit integers """
+
+    values = array('i', values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_int_array(buf, offset, count):
+    """ Read a list of little-endian 32-bit integers from a buffer """
+
+    values = array('i')
+    values.frombytes(buf[offset:offset+4*count])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def pack_dungeon(d, moves=0, attacks=0, score=0, done_status=False):
+    """ Return the bytes of the save file of a dungeon and game state """
+
+    algorithm = d.algorithm.encode()
+    if len(algorithm) > 16:
+        raise Exception('Algorithm name \'{}\' is too long to save.'.format(d.algorithm))
+
+    header = HEADER.pack(MAGIC, VERSION, DONE if done_status else 0,
+        d.width, d.height, d.exploration, algorithm, d.current_cell,
+        moves, attacks, score, len(d.enemies), len(d.rewards))
+
+    return header + pack_walls(d.walls) + int_array(d.enemies) + int_array(d.rewards)
+
+
+def unpack_dungeon(cls, buf, offset=0):
+    """ Make a dungeon of the given class from a save file held in a
+        buffer, starting at the given offset, and return it with the
+        game state in the form made by make_new_dungeon """
+
+    magic, version, flags, width, height, exploration, algorithm, current_cell, \
+        moves, attacks, score, num_enemies, num_rewards = HEADER.unpack_from(buf, offset)
+
+    if magic != MAGIC:
+        raise Exception('Data at offset \'{}\' is not a dungeon save file.'.format(offset))
+    if version != VERSION:
+        raise Exception('Save file version \'{}\' is not supported.'.format(version))
+
+    d = cls(width, height, exploration, algorithm.rstrip(b'\0').decode())
+    cells = width*height
+
+    # The wall mask and entity indices are built whole from the saved
+    # arrays, in place of those the dungeon was made with
+    offset += HEADER.size
+    d.walls = unpack_walls(buf[offset:offset+(cells+1)//2], cells)
+    offset += (cells+1)//2
+
+    d.enemies = EntityIndex(read_int_array(buf, offset, num_enemies))
+    offset += 4*num_enemies
+    d.rewards = EntityIndex(read_int_array(buf, offset, num_rewards))
+
+    d.current_cell = current_cell
+    return d, moves, attacks, num_enemies, score, bool(flags & DONE)
+
+
+def save_size(buf, offset=0):
+    """ Return the number of bytes in the save file starting at the given
+        offset of a buffer """
+
+    fields = HEADER.unpack_from(buf, offset)
+    width, height, num_enemies, num_rewards = fields[3], fields[4], fields[11], fields[12]
+    return HEADER.size + (width*height+1)//2 + 4*(num_enemies + num_rewards)
+
+
+def save(path, d, **state):
+    """ Write a dungeon and game state to a save file """
+
+    with open(path, 'wb') as f:
+        f.write(pack_dungeon(d, **state))
+
+
+def load(cls, path, offset=0):
+    """ Memory-map a save file and make a dungeon of the given class from
+        the save at the given offset, with its game state """
+
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return unpack_dungeon(cls, buf, offset)
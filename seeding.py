@@ -0,0 +1,39 @@
+### Seeding scheme for reproducible random number streams
+### Date:     10/17/2026
+###
+### Every stream of random numbers is a random.Random seeded from an
+### integer.  Streams for separate purposes (generating a level, playing
+### it, a policy choosing keys) or for parallel workers are given seeds
+### derived from one parent seed, so that none of them share numbers and
+### each can be rebuilt on its own from the parent seed.
+
+import random
+import hashlib
+
+
+def derive_seed(seed, *labels):
+	""" Return the seed of an independent stream, named by the labels,
+		derived from a parent seed """
+
+	digest = hashlib.sha256(repr((seed,) + labels).encode()).digest()
+	return int.from_bytes(digest[:8], 'little')
+
+
+def make_rng(seed=None, *labels):
+	""" Return a random number generator seeded from a parent seed and
+		labels (or from the system if there is no seed) """
+
+	if seed is None:
+		return random.Random()
+	return random.Random(derive_seed(seed, *labels) if labels else seed)
+
+
+def fork(rng, n):
+	""" Return n independent generators, seeded from draws of the given
+		generator, for parallel workers """
+	return [random.Random(rng.getrandbits(64)) for _ in range(n)]
+
+
+def new_seed():
+	""" Return a fresh seed from the system """
+	return random.SystemRandom().getrandbits(63)
@@ -0,0 +1,382 @@
+### Multiplayer server sharing one dungeon among many players
+### Date:     10/17/2026
+###
+### Usage:  python server.py [--host 127.0.0.1] [--port 7007 | --unix PATH]
+###                          [--size 60x30] [--tick 0.2] [--seed N]
+###
+### One dungeon, held by the server, is played by every connected player,
+### each with their own position, attacks, and score.  Clients send keys as
+### single bytes.  Once a tick, the server plays the last key each player
+### sent since the tick before, all in one batch in order of player ID, then
+### moves the enemies, so a player can neither queue up moves nor act more
+### often than anyone else.  Reaching the goal scores as in the single
+### player game and starts a new level for everyone; running into an enemy
+### costs 100 points and sends the player back to the start.
+###
+### A player joining is sent the whole level, as a save file (see
+### savefile.py).  After that, each tick is broadcast as one delta, the
+### same bytes for every player, holding only the cells whose walls or
+### contents changed and the players whose state changed.  A player who
+### cannot keep up is sent no deltas until they catch up, then the whole
+### level again.
+###
+### Every message is a frame header (payload length, message type),
+### followed by the payload, little-endian throughout:
+###   WELCOME   the player's ID, then a SNAPSHOT payload
+###   SNAPSHOT  turn, number of players, player records, save file
+###   DELTA     turn, number of cell records, of player records, and of
+###             players who left, then the records and the IDs of those
+###             who left
+
+import sys
+import time
+import struct
+import asyncio
+import argparse
+from collections import deque
+from savefile import pack_dungeon
+from seeding import make_rng, new_seed
+from session import make_new_dungeon, DIRMAP, ATKMAP
+
+PORT = 7007
+TICK = 0.2
+
+# Connections which may be waiting to be accepted, enough for hundreds of
+# players joining at once
+BACKLOG = 1024
+
+# Bytes which may be waiting to be sent to a player before they are
+# counted as too slow to keep up
+MAX_BUFFER = 1 << 16
+
+# Message framing: payload length and message type
+FRAME = struct.Struct('<IB')
+WELCOME, SNAPSHOT, DELTA = 1, 2, 3
+
+# Player IDs are never reused, so they take 32 bits
+SNAPSHOT_HEADER = struct.Struct('<II')		# Turn, number of players
+DELTA_HEADER = struct.Struct('<IIII')		# Turn, cells, players, players left
+PLAYER_ID = struct.Struct('<I')
+PLAYER = struct.Struct('<IIiII')			# ID, cell, score, attacks, moves
+CELL = struct.Struct('<IBB')				# Cell, wall mask, contents
+
+# Contents of a cell record
+ENEMY = 1
+REWARD = 2
+
+
+def frame(kind, payload):
+	""" Return a message of the given type, framed for sending """
+	return FRAME.pack(len(payload), kind) + payload
+
+
+class Player:
+	""" One connected player: their place in the dungeon, their game state,
+		and the stream their updates are written to """
+
+	def __init__(self, id, writer, attacks):
+		self.id      = id
+		self.writer  = writer
+		self.cell    = 0
+		self.attacks = attacks
+		self.score   = 0
+		self.moves   = 0
+		self.key     = None		# Last key sent since the last turn
+		self.stale   = False	# Skipped a delta, and needs the whole level
+
+
+	def record(self):
+		""" Return the player's state as a player record """
+		return PLAYER.pack(self.id, self.cell, self.score, self.attacks, self.moves)
+
+
+class GameServer:
+	""" The dungeon shared by every player, played a turn each tick """
+
+	def __init__(self, height, width, seed=None, tick=TICK, **params):
+		""" Set the board size, the seed the levels and the enemies' moves
+			are drawn from (a fresh one if not given), and the interval
+			between turns.  Other keyword arguments are passed on to
+			make_new_dungeon. """
+
+		self.height  = height
+		self.width   = width
+		self.seed    = seed if seed is not None else new_seed()
+		self.tick    = tick
+		self.params  = params
+		self.rng     = make_rng(self.seed, 'play')
+
+		self.players = {}		# Connected players, by ID
+		self.next_id = 0
+		self.left    = []		# IDs of players who left since the last turn
+		self.changed = set()	# IDs of players changed since the last turn
+		self.turn    = 0
+		self.level   = 0
+
+		# Time and size of recent turns, for the status line
+		self.times   = deque(maxlen=100)
+		self.sent    = deque(maxlen=100)
+
+		self.new_level()
+
+
+	def new_level(self):
+		""" Start the next level, with every player back at the start """
+
+		state = make_new_dungeon(self.height, self.width,
+			rng=make_rng(self.seed, 'level', self.level), **self.params)
+		self.d = state[0]
+		self.attacks = state[2]
+		self.level += 1
+
+		for player in self.players.values():
+			player.cell = 0
+			player.attacks = self.attacks
+			player.moves = 0
+			player.stale = True
+
+		self.d.dirty.clear()
+		self.d.dirty_walls.clear()
+		self.snapshot = None
+
+
+	def snapshot_payload(self):
+		""" Return the payload of a snapshot of the current turn, made once
+			for every player who needs it """
+
+		if self.snapshot is None:
+			self.snapshot = self.snapshot_of(self.players.values())
+		return self.snapshot
+
+
+	def snapshot_of(self, players):
+		""" Return the payload of a snapshot of the current turn with the
+			given players """
+
+		players = list(players)
+		records = b''.join(p.record() for p in players)
+		return SNAPSHOT_HEADER.pack(self.turn, len(players)) + records + pack_dungeon(self.d)
+
+
+	def join(self, writer):
+		""" Add a player, sending them the whole level, and return them """
+
+		# Make the welcome before adding the player, so that the game is
+		# left as it was if it cannot be made
+		player = Player(self.next_id, writer, self.attacks)
+		welcome = frame(WELCOME, PLAYER_ID.pack(player.id)
+			+ self.snapshot_of([*self.players.values(), player]))
+
+		self.next_id += 1
+		self.players[player.id] = player
+		self.changed.add(player.id)
+		self.snapshot = None
+
+		writer.write(welcome)
+		return player
+
+
+	def leave(self, player):
+		""" Remove a player """
+
+		del self.players[player.id]
+		self.changed.discard(player.id)
+		self.left.append(player.id)
+		self.snapshot = None
+
+
+	def respond(self, player, key):
+		""" Play a move or attack key for a player, as GameSession.respond
+			does for the single player game """
+
+		d = self.d
+		d.current_cell = player.cell
+
+		if key in DIRMAP:
+			# Maze.move marks both cells dirty for the single player renderer,
+			# but their contents are unchanged and the player's record carries
+			# the move, so only marks made earlier in the turn are kept
+			cells = (player.cell, player.cell + d.steps[DIRMAP[key]])
+			unmarked = [c for c in cells if c not in d.dirty]
+			d.move(DIRMAP[key])
+			d.dirty.difference_update(unmarked)
+			player.score += 1
+
+		elif key in ATKMAP:
+			if player.attacks > 0:
+				result = d.attack(ATKMAP[key])
+				if result == 1:
+					player.score += 10
+				elif result == 2:
+					player.score += 50
+				player.attacks -= 1
+			else:
+				player.score -= 1
+
+		player.cell = d.current_cell
+		player.moves += 1
+
+
+	def play_turn(self):
+		""" Play every player's key for the turn in one batch, then move
+			the enemies, then check each player for death and completion """
+
+		d = self.d
+		for player in self.players.values():
+			if player.key is not None:
+				self.respond(player, player.key)
+				player.key = None
+				self.changed.add(player.id)
+
+		if self.players:
+			d.step_enemies(self.rng)
+
+		goal = d.cell_ids[-1]
+		for player in self.players.values():
+			if player.cell in d.enemies:
+				player.score -= 100
+				player.cell = 0
+				self.changed.add(player.id)
+
+			elif player.cell == goal:
+				player.score += self.height*self.width - player.moves
+				self.changed.add(player.id)
+				self.new_level()
+				break
+
+		self.turn += 1
+		self.snapshot = None
+
+
+	def delta_payload(self):
+		""" Return the payload of the delta of the last turn, and mark it
+			as sent """
+
+		d = self.d
+		cells = d.dirty | d.dirty_walls
+		records = [CELL.pack(i, d.walls[i], (ENEMY if i in d.enemies else 0) | (REWARD if i in d.rewards else 0))
+			for i in sorted(cells)]
+		players = [self.players[id].record() for id in sorted(self.changed)]
+
+		payload = DELTA_HEADER.pack(self.turn, len(records), len(players), len(self.left)) \
+			+ b''.join(records) + b''.join(players) + b''.join(PLAYER_ID.pack(id) for id in self.left)
+
+		d.dirty.clear()
+		d.dirty_walls.clear()
+		self.changed.clear()
+		self.left = []
+		return payload
+
+
+	def broadcast(self):
+		""" Send the delta of the last turn to every player keeping up,
+			and the whole level to those who have caught up after falling
+			behind, returning the bytes sent """
+
+		delta = frame(DELTA, self.delta_payload())
+		sent = 0
+		for player in self.players.values():
+			waiting = player.writer.transport.get_write_buffer_size()
+			if waiting > MAX_BUFFER:
+				player.stale = True
+			elif player.stale:
+				message = frame(SNAPSHOT, self.snapshot_payload())
+				player.writer.write(message)
+				player.stale = False
+				sent += len(message)
+			else:
+				player.writer.write(delta)
+				sent += len(delta)
+		return sent
+
+
+	async def handle(self, reader, writer):
+		""" Serve one connection: add the player, and take each key they
+			send as their key for the next turn, until they disconnect """
+
+		player = self.join(writer)
+		try:
+			while True:
+				data = await reader.read(256)
+				if not data:
+					break
+				for c in data.decode('ascii', 'ignore'):
+					if c in DIRMAP or c in ATKMAP:
+						player.key = c
+		except ConnectionError:
+			pass
+		finally:
+			self.leave(player)
+			writer.close()
+
+
+	async def run_turns(self):
+		""" Play a turn and broadcast it every tick, keeping to a fixed
+			rate however long each turn takes """
+
+		loop = asyncio.get_running_loop()
+		deadline = loop.time()
+		while True:
+			deadline += self.tick
+			await asyncio.sleep(max(0, deadline - loop.time()))
+
+			start = time.perf_counter()
+			self.play_turn()
+			self.sent.append(self.broadcast())
+			self.times.append(time.perf_counter() - start)
+
+
+	def status(self):
+		""" Return a line describing the players and recent turns """
+
+		times = sorted(self.times) or [0.]
+		return 'turn {:>6}  level {:>3}  players {:>4}  turn p50 {:6.2f} ms  p99 {:6.2f} ms  sent {:>8.0f} B/turn'.format(
+			self.turn, self.level, len(self.players), 1e3*times[len(times)//2],
+			1e3*times[min(len(times)-1, int(0.99*len(times)))], sum(self.sent)/max(len(self.sent), 1))
+
+
+	async def serve(self, host='127.0.0.1', port=PORT, path=None, report=10.):
+		""" Accept players over TCP, or over a Unix socket if a path is
+			given, and play turns until cancelled, printing the status
+			every report seconds (if given) """
+
+		if path is not None:
+			server = await asyncio.start_unix_server(self.handle, path, backlog=BACKLOG)
+		else:
+			server = await asyncio.start_server(self.handle, host, port, backlog=BACKLOG)
+
+		turns = asyncio.ensure_future(self.run_turns())
+		try:
+			async with server:
+				while True:
+					await asyncio.sleep(report or 3600)
+					if report:
+						print(self.status(), flush=True)
+		finally:
+			turns.cancel()
+
+
+def main(argv):
+
+	parser = argparse.ArgumentParser(description='Host one dungeon for many players.')
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=PORT)
+	parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+	parser.add_argument('--size', default='60x30', help='board size as WIDTHxHEIGHT')
+	parser.add_argument('--tick', type=float, default=TICK, help='seconds between turns')
+	parser.add_argument('--seed', type=int)
+	args = parser.parse_args(argv)
+
+	width, height = (int(n) for n in args.size.split('x'))
+	server = GameServer(height, width, args.seed, args.tick)
+	print('Serving seed {} on {}'.format(server.seed, args.unix or '{}:{}'.format(args.host, args.port)), flush=True)
+
+	try:
+		asyncio.run(server.serve(args.host, args.port, args.unix))
+	except KeyboardInterrupt:
+		pass
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,184 @@
+### Headless game session for the dungeon crawler
+### Date:     10/17/2026
+
+from dungeon import Dungeon
+from seeding import make_rng, new_seed
+
+# Game parameters
+EXPLORATION = 0.5
+ALGORITHM = 'dfs'
+CHASE = 0.
+ENEMY_DENSITY = 0.1
+REWARD_DENSITY = 0.01
+ATTACK_RATIO = 0.25
+
+# Controls
+DIRMAP = {'w':0, 'a':3, 's':2, 'd':1}
+ATKMAP = {'W':0, 'A':3, 'S':2, 'D':1}
+ACTIONS = list(DIRMAP) + list(ATKMAP)
+
+
+def make_new_dungeon(height, width, exploration=EXPLORATION, algorithm=ALGORITHM,
+		enemy_density=ENEMY_DENSITY, reward_density=REWARD_DENSITY, attack_ratio=ATTACK_RATIO,
+		rng=None):
+	""" Generate a new Dungeon object (from the given random number
+		generator, if any), populate it, and return game state """
+
+	enemies = int(height*width*enemy_density)
+	rewards = max(int(height*width*reward_density), 2)
+	attacks = max(5,int(enemies * attack_ratio))
+
+	# Make and populate dungeon
+	d = Dungeon(width, height, exploration, algorithm, rng)
+	d.make_maze()
+	d.make_enemies(enemies)
+	d.make_rewards(rewards)
+
+	# Make game state
+	moves = 0
+	score = 0
+	done_status = False
+
+	return d, moves, attacks, enemies, score, done_status
+
+
+class GameSession:
+	""" One game of the dungeon crawler, played without a terminal.  Owns
+		the game state made by make_new_dungeon and plays a turn for each
+		action given to step. """
+
+	def __init__(self, height, width, seed=None, chase=CHASE, state=None, **params):
+		""" Make and populate a new dungeon from the seed (a fresh one if
+			not given), or take the game state given in the form made by
+			make_new_dungeon from that seed, and start the first turn.
+			Other keyword arguments are passed on to make_new_dungeon.
+
+			The level and the play (the enemies' moves) each draw from
+			their own stream derived from the seed, so a game is replayed
+			exactly by the seed and the keys played. """
+
+		seed = seed if seed is not None else new_seed()
+		if state is None:
+			state = make_new_dungeon(height, width, rng=make_rng(seed, 'level'), **params)
+
+		self.height = height
+		self.width  = width
+		self.seed   = seed
+		self.chase  = chase
+		self.params = params
+		self.rng    = make_rng(seed, 'play')
+
+		self.d, self.moves, self.attacks, self.enemies, self.score, self.done_status = state
+
+		# Outcome of the game, once done
+		self.died = False
+		self.completed = False
+		self.finish_score = 0
+
+		self.advance()
+
+
+	def state(self):
+		""" Return the game state in the form made by make_new_dungeon """
+		return self.d, self.moves, self.attacks, self.enemies, self.score, self.done_status
+
+
+	def respond(self, action):
+		""" Apply a move or attack key to the dungeon, and return the
+			change in score it earns """
+
+		d = self.d
+		dscore = 0
+
+		# If the input matches a control character, respond appropriately
+		if action in DIRMAP and not self.done_status:
+
+			# Attempt to move the character
+			d.move(DIRMAP[action])
+			dscore = 1
+
+		elif action in ATKMAP and not self.done_status:
+
+			# Attempt to attack an enemy or break wall, if the character
+			# has attacks left to make
+			if self.attacks > 0:
+				result = d.attack(ATKMAP[action])
+
+				# If the attack resulted in a killed enemy,
+				# record the change in game state
+				if result == 1:
+					self.enemies -= 1
+					dscore = 10
+				elif result == 2:
+					dscore = 50
+
+				# Remove one available attack
+				self.attacks -= 1
+
+			else:
+				dscore = -1
+
+		return dscore
+
+
+	def advance(self):
+		""" Start the next turn: move the enemies, then check for death
+			and completion """
+
+		d = self.d
+
+		# Move each of the enemies (assuming the player has already
+		# moved at least once, to prevent insta-deaths)
+		if self.moves > 0 and not self.done_status:
+			d.step_enemies(self.rng, chase=self.chase)
+
+		self.check()
+
+
+	def check(self):
+		""" Check for death and completion, ending the game if either """
+
+		d = self.d
+
+		# Check for death
+		if d.current_cell in d.enemies:
+			self.score -= 100 if not self.done_status else 0
+			self.died = True
+			self.done_status = True
+
+		# Check for completion
+		if d.current_cell == d.cell_ids[-1]:
+			if not self.completed:
+				self.finish_score = self.height*self.width - self.moves
+			self.score += self.finish_score if not self.done_status else 0
+			self.completed = True
+			self.done_status = True
+
+
+	def step(self, action):
+		""" Play one turn with the given key (any key other than a move or
+			attack just lets the turn pass), and return the change in
+			score over the turn """
+
+		score = self.score
+		self.score += self.respond(action)
+
+		# Iterate the move counter and start the next turn
+		self.moves += 1 if not self.done_status else 0
+		self.advance()
+
+		return self.score - score
+
+
+	def act(self, action):
+		""" Play a key without moving the enemies, for games in real time,
+			where the enemies move on a clock of their own by calls to
+			advance, and return the change in score """
+
+		score = self.score
+		self.score += self.respond(action)
+
+		self.moves += 1 if not self.done_status else 0
+		self.check()
+
+		return self.score - score
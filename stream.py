@@ -0,0 +1,88 @@
+### Streaming generation and rendering of arbitrarily tall mazes
+### Date:     10/17/2026
+###
+### Usage:  python stream.py width [height] [--seed seed] > maze.txt
+###
+### Rows are generated with Eller's algorithm and rendered as they are
+### made, so only a row's worth of state is ever kept.  With no height,
+### rows are streamed until the output is closed.  With no seed, a fresh
+### one is drawn and reported on stderr, so the maze can be made again.
+
+import sys
+import argparse
+from maze import char_dict
+from generators import eller_rows
+from seeding import make_rng, new_seed
+
+
+def junction_line(horiz, above, below):
+	""" Render a line of junctions and horizontal walls, given the walls on
+		top of each cell and the vertical walls meeting each junction from
+		above and below """
+
+	# Junction pattern: wall to the right (1), below (2), to the left (4),
+	# and above (8) the junction
+	left = [0] + horiz
+	right = horiz + [0]
+	line = [char_dict[e + 2*s + 4*w + 8*n] + ('─' if e else ' ')
+		for e, s, w, n in zip(right, below, left, above)]
+	line[-1] = line[-1][0]
+	return ''.join(line)
+
+
+def cell_line(vert, states=None):
+	""" Render a line of cells and the vertical walls between them, with
+		the cell contents if given """
+
+	states = states or ' '*(len(vert)-1)
+	return ''.join(('│' if v else ' ') + s for v, s in zip(vert, states)) \
+		+ ('│' if vert[-1] else ' ')
+
+
+def render_stream(rows, width):
+	""" Render (right, down) passage flags for each row, as made by
+		eller_rows, yielding each line of text as soon as it is known """
+
+	# Vertical walls at each junction of the previous row, and horizontal
+	# walls on top of the current row
+	above = [0]*(width+1)
+	horiz = [1]*width
+
+	for right, down in rows:
+		vert = [1] + [0 if r else 1 for r in right[:width-1]] + [1]
+		yield junction_line(horiz, above, vert)
+		yield cell_line(vert)
+
+		above = vert
+		horiz = [0 if d else 1 for d in down]
+
+	# Close off the bottom of the maze
+	yield junction_line([1]*width, above, [0]*(width+1))
+
+
+def stream_maze(width, height=None, seed=None, rng=None):
+	""" Generate and render a maze one text row at a time, from the given
+		seed or random number generator.  With no height, rows are
+		generated indefinitely. """
+
+	rng = rng if rng is not None else make_rng(seed)
+	return render_stream(eller_rows(width, height, rng), width)
+
+
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Stream a maze of any height as text.')
+	parser.add_argument('width', type=int)
+	parser.add_argument('height', type=int, nargs='?')
+	parser.add_argument('--seed', type=int, help='seed of the maze (drawn afresh if not given)')
+	args = parser.parse_args()
+
+	seed = args.seed if args.seed is not None else new_seed()
+	sys.stderr.write('Seed: {}\n'.format(seed))
+
+	try:
+		for line in stream_maze(args.width, args.height, seed):
+			sys.stdout.write(line + '\n')
+	except (BrokenPipeError, KeyboardInterrupt):
+		# Stop quietly when the reader goes away, as with `| head`
+		sys.stderr.close()
@@ -0,0 +1,223 @@
+### Vectorized environment running many dungeons in lockstep
+### Date:     10/17/2026
+
+import random
+from array import array
+from cell import OPEN, OPPOSITE, OPEN_DIRS
+from maze import render_walls
+from session import GameSession, ACTIONS, DIRMAP, ATKMAP
+
+
+class VecDungeonEnv:
+	""" A batch of dungeon games held in stacked arrays rather than as
+		Dungeon objects, stepped together with one action per game.  The
+		interface follows the vectorized environments of Gym: reset()
+		returns the observations, and step(actions) returns observations,
+		rewards, done flags, and info for every game.  Games which end in
+		death or at the goal are reset automatically, as with the 'r' key.
+
+		Actions are indices into session.ACTIONS (moves, then attacks), and
+		observations are the rows of text drawn by Maze.render, with the
+		contents of each cell drawn in. """
+
+	def __init__(self, num_envs, height, width, seed=0, **params):
+		""" Set the number and size of the games, the seed from which every
+			game is generated, and any parameters for make_new_dungeon """
+
+		self.num_envs = num_envs
+		self.height   = height
+		self.width    = width
+		self.params   = params
+		self.rng      = random.Random(seed)
+
+		self.cells    = height*width
+		self.steps    = (-width, 1, width, -1)
+		self.goal     = self.cells - 1
+
+		# Offsets to the accessible neighbors for each wall mask
+		self.offsets  = [tuple(self.steps[d] for d in dirs) for dirs in OPEN_DIRS]
+
+		# Every game has the same number of enemies to begin with, known
+		# once the first game is made
+		n = num_envs*self.cells
+		self.num_enemies = None
+
+		# Stacked game state.  Cell c of game k is at index k*cells + c of
+		# the grids, and enemy e of game k at index k*num_enemies + e of
+		# enemy_pos (-1 once killed).  The enemy grid holds 1 + the enemy
+		# index in each cell with an enemy.
+		self.walls      = bytearray(n)
+		self.adjacency  = bytearray(n)
+		self.rewards    = bytearray(n)
+		self.enemy_grid = array('i', [0])*n
+		self.enemy_pos  = array('i')
+		self.player     = array('i', [0])*num_envs
+		self.moves      = array('i', [0])*num_envs
+		self.attacks    = array('i', [0])*num_envs
+		self.enemies    = array('i', [0])*num_envs
+		self.scores     = array('i', [0])*num_envs
+
+
+	def reset(self):
+		""" Start a new game in every environment, and return the
+			observations """
+
+		for k in range(self.num_envs):
+			self.reset_env(k)
+		return [self.observe(k) for k in range(self.num_envs)]
+
+
+	def reset_env(self, k):
+		""" Generate a new game for one environment from the next seed,
+			and copy its state into the stacked arrays """
+
+		session = GameSession(self.height, self.width, self.rng.getrandbits(32), **self.params)
+		d = session.d
+
+		if self.num_enemies is None:
+			self.num_enemies = session.enemies
+			self.enemy_pos = array('i', [-1])*(self.num_envs*self.num_enemies)
+
+		base = k*self.cells
+		self.walls[base:base+self.cells] = d.walls
+		self.adjacency[base:base+self.cells] = d.adjacency
+		self.rewards[base:base+self.cells] = bytes(self.cells)
+		for c in d.rewards:
+			self.rewards[base+c] = 1
+
+		self.enemy_grid[base:base+self.cells] = array('i', [0])*self.cells
+		ebase = k*self.num_enemies
+		for e, c in enumerate(d.enemies):
+			self.enemy_pos[ebase+e] = c
+			self.enemy_grid[base+c] = e+1
+
+		self.player[k]  = d.current_cell
+		self.moves[k]   = 0
+		self.attacks[k] = session.attacks
+		self.enemies[k] = session.enemies
+		self.scores[k]  = 0
+
+
+	def step(self, actions):
+		""" Play one turn of every game, and return the observations,
+			rewards (changes in score), done flags, and info for each """
+
+		rewards = [self.respond(k, ACTIONS[a]) for k, a in enumerate(actions)]
+		for k in range(self.num_envs):
+			self.moves[k] += 1
+		self.step_enemies()
+
+		dones = []
+		infos = []
+		for k in range(self.num_envs):
+			dscore, done, info = self.check(k)
+			rewards[k] += dscore
+			self.scores[k] += rewards[k]
+			info['score'] = self.scores[k]
+			info['moves'] = self.moves[k]
+			if done:
+				self.reset_env(k)
+			dones.append(done)
+			infos.append(info)
+
+		return [self.observe(k) for k in range(self.num_envs)], rewards, dones, infos
+
+
+	def respond(self, k, action):
+		""" Apply a move or attack key to one game, and return the change
+			in score it earns, as in GameSession.respond """
+
+		base = k*self.cells
+		cell = self.player[k]
+
+		if action in DIRMAP:
+			d = DIRMAP[action]
+			if self.walls[base+cell] & OPEN[d]:
+				self.player[k] = cell + self.steps[d]
+			return 1
+
+		d = ATKMAP[action]
+		if self.attacks[k] <= 0:
+			return -1
+		self.attacks[k] -= 1
+
+		target = cell + self.steps[d]
+		if self.walls[base+cell] & OPEN[d]:
+
+			# Kill an enemy or take a reward in the accessible cell
+			e = self.enemy_grid[base+target]
+			if e:
+				self.enemy_grid[base+target] = 0
+				self.enemy_pos[k*self.num_enemies+e-1] = -1
+				self.enemies[k] -= 1
+				return 10
+			elif self.rewards[base+target]:
+				self.rewards[base+target] = 0
+				return 50
+			return 0
+
+		# Otherwise break down the wall, if there is a cell beyond it
+		if self.adjacency[base+cell] & OPEN[d]:
+			self.walls[base+cell] |= OPEN[d]
+			self.walls[base+target] |= OPEN[OPPOSITE[d]]
+		return 0
+
+
+	def step_enemies(self):
+		""" Randomly move every enemy of every game in one pass, in order of
+			enemy index, never into a cell another enemy holds """
+
+		walls = self.walls
+		grid = self.enemy_grid
+		pos = self.enemy_pos
+		offsets = self.offsets
+
+		rolls = [self.rng.random() for _ in range(len(pos))]
+		for j, roll in enumerate(rolls):
+			cell = pos[j]
+			if cell < 0:
+				continue
+
+			base = (j//self.num_enemies)*self.cells
+			moves_list = [cell + o for o in offsets[walls[base+cell]] if not grid[base+cell+o]]
+			if moves_list:
+				target = moves_list[int(roll*len(moves_list))]
+				grid[base+target] = grid[base+cell]
+				grid[base+cell] = 0
+				pos[j] = target
+
+
+	def check(self, k):
+		""" Check one game for death and completion, returning the change
+			in score, whether the game is done, and its outcome """
+
+		cell = self.player[k]
+		if self.enemy_grid[k*self.cells+cell]:
+			return -100, True, {'died': True, 'completed': False}
+		elif cell == self.goal:
+			return self.cells - self.moves[k], True, {'died': False, 'completed': True}
+		return 0, False, {}
+
+
+	def observe(self, k):
+		""" Return the rows of text drawing one game, as Dungeon.render
+			draws them, with every cell's contents in place """
+
+		base = k*self.cells
+		rows = [list(r) for r in render_walls(self.walls[base:base+self.cells], self.width, self.height)]
+
+		def draw(c, state):
+			rows[2*(c//self.width)+1][2*(c%self.width)+1] = state
+
+		# Draw in reverse order of precedence, as in cell_state_render
+		for c in range(self.cells):
+			if self.rewards[base+c]:
+				draw(c, '*')
+		draw(self.goal, 'X')
+		for e in self.enemy_pos[k*self.num_enemies:(k+1)*self.num_enemies]:
+			if e >= 0:
+				draw(e, 'o')
+		cell = self.player[k]
+		draw(cell, '+' if self.enemy_grid[base+cell] else 'x')
+
+		return [''.join(r) for r in rows]
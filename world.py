@@ -0,0 +1,266 @@
+### Chunked, unbounded dungeon world generated as it is explored
+### Date:     10/17/2026
+###
+### The world is split into square chunks of cells, each generated as its
+### own maze the first time it is needed, from a stream seeded by the world
+### seed and the chunk's coordinates.  The borders between chunks are
+### stitched with a few openings chosen from a stream seeded by the border's
+### coordinates, so both chunks agree on them without either generating the
+### other, and every chunk is reachable from every other.  Only a bounded
+### number of chunks are held in memory; chunks changed by the player are
+### written to disk when evicted, and the rest are simply generated again.
+
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from cell import OPEN, OPPOSITE
+from maze import Maze, render_walls
+from savefile import pack_walls, unpack_walls, int_array, read_int_array
+from seeding import make_rng, new_seed
+
+# World parameters, and the number of chunks kept if no view size is given
+CHUNK_SIZE = 16
+MAX_CHUNKS = 64
+OPENINGS = 2
+REWARDS_PER_CHUNK = 2
+
+# Offsets to the neighboring cell in each direction, as (x, y)
+MOVES = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def view_chunks(width, height, chunk_size=CHUNK_SIZE):
+	""" Return the most chunks a view of the given size in cells can
+		overlap, wherever it is placed """
+	return ((width + chunk_size - 2)//chunk_size + 1) * ((height + chunk_size - 2)//chunk_size + 1)
+
+
+class Chunk:
+	""" One square of the world: the wall mask of its cells, and the cells
+		holding rewards, by position within the chunk """
+
+	def __init__(self, walls, rewards, modified=False):
+		self.walls    = walls
+		self.rewards  = rewards
+		self.modified = modified	# Changed since it was generated
+
+
+class World:
+	""" An unbounded dungeon, made of chunks generated lazily on first use
+		and kept in a least recently used cache """
+
+	def __init__(self, seed=None, exploration=0.5, algorithm='dfs', chunk_size=CHUNK_SIZE,
+			max_chunks=None, view=None, directory=None):
+		""" Set the world seed (a fresh one if not given), the generation
+			parameters of the chunks, and the number of chunks to keep in
+			memory.  Unless given, the number kept is enough for the
+			(width, height) in cells of the view drawn from the world, and
+			a ring of chunks around it, so that every frame and the ground
+			just left stay in memory.  Evicted chunks that were changed are
+			written to the given directory, or to a temporary one removed
+			on close. """
+
+		if max_chunks is None:
+			max_chunks = MAX_CHUNKS if view is None \
+				else view_chunks(view[0] + 2*chunk_size, view[1] + 2*chunk_size, chunk_size)
+
+		self.seed        = seed if seed is not None else new_seed()
+		self.exploration = exploration
+		self.algorithm   = algorithm
+		self.size        = chunk_size
+		self.max_chunks  = max_chunks
+		self.chunks      = OrderedDict()	# Loaded chunks, by chunk coordinates
+
+		self.temporary = directory is None
+		self.directory = tempfile.mkdtemp(prefix='terminal_dungeon_') if directory is None else directory
+		os.makedirs(self.directory, exist_ok=True)
+
+		# Player position, as (x, y) cell coordinates
+		self.player = (0, 0)
+
+
+	def __repr__(self):
+		return 'World(seed={}, chunks loaded={})'.format(self.seed, len(self.chunks))
+
+
+	def locate(self, x, y):
+		""" Return the chunk coordinates of a cell, and its index within
+			the chunk """
+		cx, lx = divmod(x, self.size)
+		cy, ly = divmod(y, self.size)
+		return (cx, cy), ly*self.size + lx
+
+
+	def openings(self, axis, cx, cy):
+		""" Return the positions along the border to the right of ('x') or
+			below ('y') a chunk where passages cross into the next chunk """
+		rng = make_rng(self.seed, 'border', axis, cx, cy)
+		return rng.sample(range(self.size), OPENINGS)
+
+
+	def generate(self, cx, cy):
+		""" Generate a chunk as a maze of its own, then open the passages
+			across its four borders """
+
+		size = self.size
+		rng = make_rng(self.seed, 'chunk', cx, cy)
+
+		m = Maze(size, size, self.exploration, self.algorithm, rng)
+		m.make_maze()
+		walls = m.walls
+
+		for r in self.openings('x', cx, cy):
+			walls[r*size + size-1] |= OPEN[1]
+		for r in self.openings('x', cx-1, cy):
+			walls[r*size] |= OPEN[3]
+		for c in self.openings('y', cx, cy):
+			walls[(size-1)*size + c] |= OPEN[2]
+		for c in self.openings('y', cx, cy-1):
+			walls[c] |= OPEN[0]
+
+		return Chunk(walls, set(rng.sample(range(size*size), REWARDS_PER_CHUNK)))
+
+
+	def chunk_path(self, key):
+		""" Return the path a changed chunk is written to when evicted """
+		return os.path.join(self.directory, 'chunk_{}_{}.bin'.format(*key))
+
+
+	def chunk(self, key):
+		""" Return the chunk at the given chunk coordinates, reading it
+			from disk or generating it if it is not in memory """
+
+		if key in self.chunks:
+			self.chunks.move_to_end(key)
+			return self.chunks[key]
+
+		path = self.chunk_path(key)
+		if os.path.exists(path):
+			with open(path, 'rb') as f:
+				data = f.read()
+			n = (self.size*self.size + 1)//2
+			walls = unpack_walls(data[:n], self.size*self.size)
+			rewards = set(read_int_array(data, n, (len(data)-n)//4))
+			chunk = Chunk(walls, rewards, modified=True)
+		else:
+			chunk = self.generate(*key)
+
+		self.chunks[key] = chunk
+		while len(self.chunks) > self.max_chunks:
+			self.evict()
+		return chunk
+
+
+	def evict(self):
+		""" Drop the least recently used chunk, writing it to disk first if
+			it has changed """
+
+		key, chunk = self.chunks.popitem(last=False)
+		if chunk.modified:
+			with open(self.chunk_path(key), 'wb') as f:
+				f.write(pack_walls(chunk.walls) + int_array(sorted(chunk.rewards)))
+
+
+	def walls(self, x, y):
+		""" Return the wall mask of a cell """
+		key, i = self.locate(x, y)
+		return self.chunk(key).walls[i]
+
+
+	def can_move(self, x, y, direction):
+		""" Identify whether the passage from a cell in a direction is open """
+		return bool(self.walls(x, y) & OPEN[direction])
+
+
+	def neighbor(self, x, y, direction):
+		""" Return the cell next to a cell in a direction """
+		dx, dy = MOVES[direction]
+		return x + dx, y + dy
+
+
+	def move(self, direction):
+		""" Move the player in the requested direction, if the passage is
+			open """
+
+		if self.can_move(*self.player, direction):
+			self.player = self.neighbor(*self.player, direction)
+			return 0
+		return -1
+
+
+	def attack(self, direction):
+		""" Attack into the cell in the requested direction, taking any
+			reward in it, or break down the wall in the way, as with
+			Dungeon.attack """
+
+		x, y = self.player
+		target = self.neighbor(x, y, direction)
+
+		if self.can_move(x, y, direction):
+			key, i = self.locate(*target)
+			chunk = self.chunk(key)
+			if i in chunk.rewards:
+				chunk.rewards.remove(i)
+				chunk.modified = True
+				return 2
+			return -1
+
+		# Open the passage from both sides, which may be in two chunks
+		for (cx, cy), d in ((self.player, direction), (target, OPPOSITE[direction])):
+			key, i = self.locate(cx, cy)
+			chunk = self.chunk(key)
+			chunk.walls[i] |= OPEN[d]
+			chunk.modified = True
+		return 0
+
+
+	def focus(self):
+		""" Return the (x, y) position of the player, for the camera of a
+			view to follow """
+		return self.player
+
+
+	def view_walls(self, x0, y0, width, height):
+		""" Return the wall mask of a rectangle of cells, row by row,
+			assembled from slices of the chunks covering it """
+
+		size = self.size
+		walls = bytearray()
+		for y in range(y0, y0+height):
+			x = x0
+			while x < x0+width:
+				key, i = self.locate(x, y)
+				run = min(size - x%size, x0+width - x)
+				walls += self.chunk(key).walls[i:i+run]
+				x += run
+		return walls
+
+
+	def render_view(self, x0, y0, width, height):
+		""" Return the rectangle of the world with its upper left cell at
+			(x0, y0) as a rendered drawing, in the form returned by
+			Maze.render, with the rewards and player in layers """
+
+		print_rows = render_walls(self.view_walls(x0, y0, width, height), width, height, open_edges=True)
+		layers = [[], [], []]
+
+		# Rewards in every chunk overlapping the view
+		size = self.size
+		for cy in range(y0//size, (y0+height-1)//size + 1):
+			for cx in range(x0//size, (x0+width-1)//size + 1):
+				for i in self.chunk((cx, cy)).rewards:
+					x, y = cx*size + i%size, cy*size + i//size
+					if x0 <= x < x0+width and y0 <= y < y0+height:
+						layers[0].append((2*(x-x0)+1, 2*(y-y0)+1, '*'))
+
+		x, y = self.player
+		if x0 <= x < x0+width and y0 <= y < y0+height:
+			layers[2].append((2*(x-x0)+1, 2*(y-y0)+1, 'x'))
+
+		return print_rows, layers
+
+
+	def close(self):
+		""" Remove the chunk directory, if it was a temporary one """
+		if self.temporary:
+			shutil.rmtree(self.directory, ignore_errors=True)